@@ -1,5 +1,8 @@
+import time
+
 from app.configs.configs import APP_NAME
-from fastapi import FastAPI
+from app.helpers.metrics import request_seconds, requests_total
+from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
 
 from .routes import api_router
@@ -15,5 +18,22 @@ application.add_middleware(
     allow_headers=["*"],  # Allows all headers
 )
 
+
+@application.middleware("http")
+async def record_metrics(request: Request, call_next):
+    start = time.perf_counter()
+    status_code = 500
+    try:
+        response = await call_next(request)
+        status_code = response.status_code
+        return response
+    finally:
+        # label by route template, unmatched paths share one series
+        route = request.scope.get("route")
+        path = route.path if route is not None else "unmatched"
+        request_seconds.observe(time.perf_counter() - start, request.method, path)
+        requests_total.inc(request.method, path, str(status_code))
+
+
 # including the endpoints from all routes
 application.include_router(api_router)
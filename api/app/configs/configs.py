@@ -33,7 +33,28 @@ log.addHandler(handler)
 
 
 APP_NAME = "DFSLineupOptimizer"
+DATA_DIR = os.getenv("DATA_DIR", "/app/data")
 SERVER_PORT = int(os.getenv("SERVER_PORT", "8080"))
+# MILP backend used by the lineup optimizer, see app.db.solvers.SOLVERS
+SOLVER_BACKEND = os.getenv("SOLVER_BACKEND", "cbc")
+# Worker processes for app.db.parallel, 0 sizes the pool to the available cores
+OPTIMIZER_WORKERS = int(os.getenv("OPTIMIZER_WORKERS", "0"))
+# /optimize admission control: concurrent solves, waiting requests and the
+# longest a request may wait for a slot (seconds) before getting a 503
+OPTIMIZE_MAX_CONCURRENCY = int(os.getenv("OPTIMIZE_MAX_CONCURRENCY", "2"))
+OPTIMIZE_MAX_QUEUE = int(os.getenv("OPTIMIZE_MAX_QUEUE", "8"))
+OPTIMIZE_QUEUE_TIMEOUT = float(os.getenv("OPTIMIZE_QUEUE_TIMEOUT", "10"))
+# /optimize result cache: max entries and time to live (seconds)
+OPTIMIZE_CACHE_SIZE = int(os.getenv("OPTIMIZE_CACHE_SIZE", "256"))
+OPTIMIZE_CACHE_TTL = float(os.getenv("OPTIMIZE_CACHE_TTL", "3600"))
+# Memory budget of the in-process projection store in bytes, 0 is unlimited
+PROJECTION_STORE_MAX_BYTES = int(os.getenv("PROJECTION_STORE_MAX_BYTES", "0"))
+# How often (seconds) the data manifest is checked for changes
+MANIFEST_REFRESH_INTERVAL = float(os.getenv("MANIFEST_REFRESH_INTERVAL", "5"))
+# On-disk cache of FantasyPros responses, mode is online, replay or off
+HTTP_CACHE_DIR = os.getenv("HTTP_CACHE_DIR", f"{DATA_DIR}/http_cache")
+HTTP_CACHE_MAX_BYTES = int(os.getenv("HTTP_CACHE_MAX_BYTES", str(256 * 2**20)))
+HTTP_CACHE_MODE = os.getenv("HTTP_CACHE_MODE", "online")
 
 
 class NFLTeam(Enum):
@@ -0,0 +1,88 @@
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from app.db.solvers import get_solver
+
+POSITIONS = ["QB", "RB", "WR", "TE", "DST"]
+
+# (lower, upper) number of players per position, upper=None means unbounded
+PositionLimits = Dict[str, Tuple[int, Optional[int]]]
+
+
+class LineupModel:
+    """Array-backed DraftKings lineup model.
+
+    The player pool is converted to NumPy vectors (salary, projection and a
+    position one-hot matrix) once, and the objective and every roster constraint
+    are emitted from those arrays in bulk instead of per-row pandas lookups.
+
+    The model is persistent: the constraint set is kept between solves and
+    ``set_objective`` only swaps the objective coefficients. Solving is delegated
+    to a backend from ``app.db.solvers`` compiled once for this model.
+    """
+
+    def __init__(
+        self,
+        players: pd.DataFrame,
+        budget: int,
+        total_players: int,
+        position_limits: PositionLimits,
+        solver: Optional[str] = None,
+    ):
+        self.index = players.index
+        self.names = players["player"].to_numpy()
+        self.salary = players["salary"].to_numpy(dtype=np.int64)
+        self.points = players["proj_fpts"].to_numpy(dtype=np.float64)
+        self.position_matrix = (
+            players["position"].to_numpy()[None, :] == np.array(POSITIONS)[:, None]
+        )
+        self.budget = int(budget)
+        self.total_players = int(total_players)
+        self.position_limits = position_limits
+        self.solution: Optional[np.ndarray] = None
+        # (selection, max_overlap) uniqueness cuts added between solves
+        self.cuts: List[Tuple[np.ndarray, int]] = []
+        self.solver = get_solver(solver)(self)
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+    def constraints(self) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """Return the roster constraints and cuts as ``lower <= A @ x <= upper``."""
+        A = np.vstack(
+            [np.ones(len(self)), self.salary, self.position_matrix]
+            + [selection for selection, _ in self.cuts]
+        ).astype(np.float64)
+        lower = [self.total_players, -np.inf]
+        upper = [self.total_players, self.budget]
+        for position in POSITIONS:
+            position_lower, position_upper = self.position_limits[position]
+            lower.append(position_lower)
+            upper.append(np.inf if position_upper is None else position_upper)
+        for _, max_overlap in self.cuts:
+            lower.append(-np.inf)
+            upper.append(max_overlap)
+        return A, np.array(lower, dtype=np.float64), np.array(upper, dtype=np.float64)
+
+    def set_objective(self, points: np.ndarray) -> None:
+        points = np.asarray(points, dtype=np.float64)
+        if np.array_equal(points, self.points):
+            return
+        self.points = points
+        self.solver.set_objective(points)
+
+    def add_cut(self, selection: np.ndarray, max_overlap: int) -> None:
+        """Allow at most ``max_overlap`` of the ``selection`` players from now on."""
+        selection = np.asarray(selection, dtype=bool)
+        self.cuts.append((selection, int(max_overlap)))
+        self.solver.add_cut(selection, int(max_overlap))
+
+    def solve(self) -> Optional[np.ndarray]:
+        """Solve the model and return a boolean mask of the selected players.
+
+        Returns None when no lineup satisfies the constraints and cuts.
+        """
+        self.solution = self.solver.solve()
+        return self.solution
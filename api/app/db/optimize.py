@@ -1,34 +1,51 @@
+import time
 from datetime import datetime
-from typing import List, Optional
+from typing import List, Optional, Tuple
 
 import pandas as pd
-import pulp
-from pulp import PULP_CBC_CMD
 
 from app.configs.configs import NFLTeam, log
+from app.db.model import LineupModel
+from app.db.storage import csv_path, dataset_path, read_table, write_partition
+from app.db.store import projection_store
+from app.helpers.changes import publish_changes, write_if_changed
+from app.helpers.manifest import update_manifest
+from app.helpers.metrics import span, span_seconds
+from app.helpers.names import normalize_names
 from app.helpers.optimize import get_latest_week, get_stats, get_weekly_rankings
 
 
 class DFSLineupOptimizer:
-    def __init__(self, year: Optional[int] = None, week: Optional[int] = None):
+    def __init__(
+        self,
+        year: Optional[int] = None,
+        week: Optional[int] = None,
+        solver: Optional[str] = None,
+    ):
         self.current_year = datetime.now().year if year is None else year
         self.current_week = get_latest_week(year=year) if week is None else week
+        # None falls back to the deployment's SOLVER_BACKEND
+        self.solver = solver
 
     def get_salary_df(self) -> pd.DataFrame:
-        path_to_csv = (
-            f"/app/data/salaries/dk_salary_{self.current_year}_w{self.current_week}.csv"
+        return read_table(
+            "salaries",
+            dataset_path("salaries", self.current_year, self.current_week),
         )
-        return pd.read_csv(path_to_csv)
+
+    def get_projections_path(self) -> str:
+        return dataset_path("projections", self.current_year, self.current_week)
+
+    def get_projections_version(self) -> str:
+        """Content hash of the stored projections, changes only with their content."""
+        return projection_store.content_hash(self.get_projections_path())
 
     def get_projections_df(self, use_stored_data: bool = False) -> pd.DataFrame:
         year = self.current_year
         week = self.current_week
 
         if use_stored_data:
-            log.info("Using stored data")
-            return pd.read_csv(
-                f"/app/data/projections/fp_projection_{year}_w{week}.csv"
-            )
+            return projection_store.get(self.get_projections_path())
 
         df = pd.DataFrame()
         for pos in ["QB", "RB", "WR", "TE", "DST"]:
@@ -45,21 +62,7 @@ class DFSLineupOptimizer:
                 ]
             )
 
-        df["player"] = df.apply(
-            lambda x: (
-                x["player"].split()[-1]
-                if x["position"] == "DST"
-                else x["player"]
-                .replace("II", "")
-                .replace(" I", "")
-                .replace("Jr.", "")
-                .replace("Sr.", "")
-                .replace(".", "")
-                .replace("'", "")
-                .strip()
-            ),
-            axis=1,
-        )
+        df["player"] = normalize_names(df["player"], df["position"])
         df = df[~df.grade.isin(["F", "D-", "D", "D+"])]
         df = df.merge(self.get_salary_df())
         df = df[
@@ -80,36 +83,45 @@ class DFSLineupOptimizer:
 
         log.info("Saving projection data..")
         df = df.fillna(0)
-        output_path = f"/app/data/projections/fp_projection_{year}_w{week}.csv"
-        df.drop_duplicates().to_csv(output_path, index=False)
+        saved = df.drop_duplicates()
+        path_to_csv = csv_path("projections", year, week)
+        if (record := write_if_changed(saved, path_to_csv)) is None:
+            log.info("Projections for %s week %s are unchanged", year, week)
+            return df
+        write_partition(saved, "projections", year, week)
+        update_manifest("projections", year, week, path_to_csv, len(saved))
+        publish_changes(year, week, record)
+        log.info("%s players changed", len(record["players"]))
         return df
 
-    def optimize(
+    @staticmethod
+    def weighted_fpts(df: pd.DataFrame, weights: dict) -> pd.Series:
+        return round(
+            df["proj_fpts"] * weights["proj_fpts"]
+            + df["avg_fpts"] * weights["avg_fpts"],
+            1,
+        )
+
+    def build_model(
         self,
+        df: pd.DataFrame,
         dst: Optional[NFLTeam] = None,
         one_te: Optional[bool] = False,
-        use_avg_fpts: bool = False,
-        weights: dict = {},
         excluded_players: List[str] = [],
         included_players: List[str] = [],
-        use_stored_data: bool = False,
-    ) -> pd.DataFrame:
+    ) -> Tuple[LineupModel, List[str]]:
+        """Build the roster model for the given pool.
+
+        The constraint set only depends on the pool and the dst/lock/exclude
+        options, so the returned model can be re-solved for any objective. Also
+        returns the players locked into the lineup outside of the model.
+        """
+        start = time.perf_counter()
         selected_players = []
         budget = 50000
         total_players = 9
         QB_limit, RB_limit, WR_limit, TE_limit, DST_limit = 1, 2, 3, 1, 1
 
-        # Get data
-        df = self.get_projections_df(use_stored_data=use_stored_data)
-
-        # If specified, factor in avg_fpts
-        if use_avg_fpts:
-            df["proj_fpts"] = round(
-                df["proj_fpts"] * weights["proj_fpts"]
-                + df["avg_fpts"] * weights["avg_fpts"],
-                1,
-            )
-
         # Handle excluded players
         df = df[~df["player"].isin(excluded_players)]
 
@@ -166,89 +178,82 @@ class DFSLineupOptimizer:
 
         # Remove selected players from the dataframe used for sampling
         opt_df = df[~df["player"].isin(selected_players)]
+        span_seconds.observe(time.perf_counter() - start, "filter")
 
-        # Create the optimization problem
-        prob = pulp.LpProblem("FantasyFootballOptimization", pulp.LpMaximize)
-
-        # Decision variables
-        selected_vars = pulp.LpVariable.dicts("Selected", opt_df.index, cat="Binary")
+        # Build the array-backed model
+        with span("build"):
+            model = LineupModel(
+                opt_df,
+                budget=budget,
+                total_players=total_players,
+                position_limits={
+                    "QB": (QB_limit, QB_limit),
+                    "RB": (RB_limit, None),
+                    "WR": (WR_limit, None),
+                    "TE": (TE_limit, TE_limit if one_te else None),
+                    "DST": (DST_limit, DST_limit),
+                },
+                solver=self.solver,
+            )
+        return model, selected_players
 
-        # Objective function
-        prob += pulp.lpSum(
-            opt_df.loc[i, "proj_fpts"] * selected_vars[i] for i in opt_df.index
-        )
+    @staticmethod
+    def solve_lineup(
+        model: LineupModel, df: pd.DataFrame, locked_players: List[str]
+    ) -> pd.DataFrame:
+        # Swap in the objective for the current proj_fpts and re-solve
+        model.set_objective(df.loc[model.index, "proj_fpts"].to_numpy())
+        with span("solve"):
+            selection = model.solve()
+        # an infeasible model leaves only the locked players
+        picked = [] if selection is None else model.names[selection].tolist()
+        return df[df["player"].isin(locked_players + picked)]
 
-        # Constraints
-        prob += pulp.lpSum(selected_vars[i] for i in opt_df.index) == total_players
-        prob += (
-            pulp.lpSum(opt_df.loc[i, "salary"] * selected_vars[i] for i in opt_df.index)
-            <= budget
-        )
-        prob += (
-            pulp.lpSum(
-                selected_vars[i]
-                for i in opt_df.index
-                if opt_df.loc[i, "position"] == "QB"
-            )
-            == QB_limit
-        )
-        prob += (
-            pulp.lpSum(
-                selected_vars[i]
-                for i in opt_df.index
-                if opt_df.loc[i, "position"] == "RB"
-            )
-            >= RB_limit
-        )
-        prob += (
-            pulp.lpSum(
-                selected_vars[i]
-                for i in opt_df.index
-                if opt_df.loc[i, "position"] == "WR"
-            )
-            >= WR_limit
-        )
-        if one_te:
-            prob += (
-                pulp.lpSum(
-                    selected_vars[i]
-                    for i in opt_df.index
-                    if opt_df.loc[i, "position"] == "TE"
-                )
-                == TE_limit
-            )
-        else:
-            prob += (
-                pulp.lpSum(
-                    selected_vars[i]
-                    for i in opt_df.index
-                    if opt_df.loc[i, "position"] == "TE"
-                )
-                >= TE_limit
-            )
-        prob += (
-            pulp.lpSum(
-                selected_vars[i]
-                for i in opt_df.index
-                if opt_df.loc[i, "position"] == "DST"
-            )
-            == DST_limit
+    def optimize(
+        self,
+        dst: Optional[NFLTeam] = None,
+        one_te: Optional[bool] = False,
+        use_avg_fpts: bool = False,
+        weights: dict = {},
+        excluded_players: List[str] = [],
+        included_players: List[str] = [],
+        use_stored_data: bool = False,
+    ) -> pd.DataFrame:
+        # Get data
+        df = self.get_projections_df(use_stored_data=use_stored_data)
+        return self.optimize_pool(
+            df,
+            dst=dst,
+            one_te=one_te,
+            use_avg_fpts=use_avg_fpts,
+            weights=weights,
+            excluded_players=excluded_players,
+            included_players=included_players,
         )
 
-        # Solve the problem
-        solver = PULP_CBC_CMD(msg=False)
-        prob.solve(solver)
+    def optimize_pool(
+        self,
+        df: pd.DataFrame,
+        dst: Optional[NFLTeam] = None,
+        one_te: Optional[bool] = False,
+        use_avg_fpts: bool = False,
+        weights: dict = {},
+        excluded_players: List[str] = [],
+        included_players: List[str] = [],
+    ) -> pd.DataFrame:
+        """``optimize`` on an already loaded pool, which is left unmodified."""
+        # If specified, factor in avg_fpts
+        if use_avg_fpts:
+            df = df.assign(proj_fpts=self.weighted_fpts(df, weights))
 
-        # Return the selected players
-        selected_players.extend(
-            [
-                opt_df.loc[i, "player"]
-                for i in opt_df.index
-                if selected_vars[i].varValue == 1
-            ]
+        model, selected_players = self.build_model(
+            df,
+            dst=dst,
+            one_te=one_te,
+            excluded_players=excluded_players,
+            included_players=included_players,
         )
-        selected_lineup = df[df["player"].isin(selected_players)]
-        return selected_lineup
+        return self.solve_lineup(model, df, selected_players)
 
     def get_optimal_lineups(
         self,
@@ -258,17 +263,78 @@ class DFSLineupOptimizer:
         included_players: List[str] = [],
         use_stored_data: bool = False,
     ) -> List[dict]:
+        # Load the pool and build the model once, only the objective changes
+        df = self.get_projections_df(use_stored_data=use_stored_data)
+        model, selected_players = self.build_model(
+            df,
+            dst=dst,
+            one_te=one_te,
+            excluded_players=excluded_players,
+            included_players=included_players,
+        )
+
         lineups = []
         for weights in [(1, 0), (0.9, 0.1), (0.8, 0.2)]:
             log.info("weights=%s", weights)
-            lineup = self.optimize(
-                dst=dst,
-                one_te=one_te,
-                use_avg_fpts=True if weights[1] > 0 else False,
-                weights={"proj_fpts": weights[0], "avg_fpts": weights[1]},
-                excluded_players=excluded_players,
-                included_players=included_players,
-                use_stored_data=use_stored_data,
-            )
-            lineups.append(lineup.to_dict(orient="records"))
+            weighted_df = df
+            if weights[1] > 0:
+                weighted_df = df.assign(
+                    proj_fpts=self.weighted_fpts(
+                        df, {"proj_fpts": weights[0], "avg_fpts": weights[1]}
+                    )
+                )
+            lineup = self.solve_lineup(model, weighted_df, selected_players)
+            with span("serialize"):
+                lineups.append(lineup.to_dict(orient="records"))
         return lineups
+
+    def get_unique_lineups(
+        self,
+        num_lineups: int = 20,
+        min_unique: int = 1,
+        dst: Optional[NFLTeam] = None,
+        one_te: Optional[bool] = False,
+        excluded_players: List[str] = [],
+        included_players: List[str] = [],
+        use_stored_data: bool = False,
+    ) -> Tuple[List[List[dict]], List[float]]:
+        """Generate up to ``num_lineups`` lineups in decreasing projected points.
+
+        Any two lineups differ by at least ``min_unique`` players. After each
+        solve a no-repeat cut is added to the same live model instead of
+        rebuilding it. Also returns the time in ms spent on each lineup.
+        """
+        df = self.get_projections_df(use_stored_data=use_stored_data)
+        model, selected_players = self.build_model(
+            df,
+            dst=dst,
+            one_te=one_te,
+            excluded_players=excluded_players,
+            included_players=included_players,
+        )
+        # locked players are shared by every lineup, so all the differences
+        # have to come from the players picked by the model
+        max_overlap = model.total_players - min_unique
+
+        lineups, solve_times = [], []
+        while len(lineups) < num_lineups:
+            start = time.perf_counter()
+            with span("solve"):
+                selection = model.solve()
+            if selection is None:
+                log.info("No more lineups with min_unique=%s", min_unique)
+                break
+            lineup = df[
+                df["player"].isin(selected_players + model.names[selection].tolist())
+            ]
+            with span("serialize"):
+                lineups.append(lineup.to_dict(orient="records"))
+            model.add_cut(selection, max_overlap)
+            solve_times.append((time.perf_counter() - start) * 1e3)
+
+        log.info(
+            "Generated %s lineups, ms per lineup: %s",
+            len(lineups),
+            [round(t, 1) for t in solve_times],
+        )
+        return lineups, solve_times
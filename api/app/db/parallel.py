@@ -0,0 +1,102 @@
+import os
+from concurrent.futures import ProcessPoolExecutor
+from typing import List, Optional
+
+import pandas as pd
+
+from app.configs.configs import OPTIMIZER_WORKERS, log
+from app.db.optimize import DFSLineupOptimizer
+
+# Set once per worker process by _init_worker
+_optimizer: Optional[DFSLineupOptimizer] = None
+_pool: Optional[pd.DataFrame] = None
+
+
+def _init_worker(year: int, week: int, solver: Optional[str], pool: pd.DataFrame):
+    global _optimizer, _pool
+    _optimizer = DFSLineupOptimizer(year=year, week=week, solver=solver)
+    _pool = pool
+
+
+def _pid(_) -> int:
+    return os.getpid()
+
+
+def _optimize(options: dict) -> List[dict]:
+    return _optimizer.optimize_pool(_pool, **options).to_dict(orient="records")
+
+
+class ParallelOptimizer:
+    """Fan independent solves for one slate out to a pool of worker processes.
+
+    The player pool is loaded once and shipped to every worker when it starts,
+    so each task only pickles its options (weights, dst, locks, excludes).
+    Results come back in the order the tasks were submitted.
+    """
+
+    def __init__(
+        self,
+        year: Optional[int] = None,
+        week: Optional[int] = None,
+        solver: Optional[str] = None,
+        max_workers: Optional[int] = None,
+        use_stored_data: bool = True,
+    ):
+        self.optimizer = DFSLineupOptimizer(year=year, week=week, solver=solver)
+        self.pool = self.optimizer.get_projections_df(use_stored_data=use_stored_data)
+        self.max_workers = max_workers or OPTIMIZER_WORKERS or os.cpu_count() or 1
+        self.executor = ProcessPoolExecutor(
+            max_workers=self.max_workers,
+            initializer=_init_worker,
+            initargs=(
+                self.optimizer.current_year,
+                self.optimizer.current_week,
+                solver,
+                self.pool,
+            ),
+        )
+        log.info("Started %s optimizer workers", self.max_workers)
+
+    def __enter__(self) -> "ParallelOptimizer":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    def close(self) -> None:
+        self.executor.shutdown()
+
+    def warm_up(self) -> None:
+        """Start every worker and wait for its initializer to finish.
+
+        Workers are otherwise spawned on the first submitted batch, which then
+        pays for the process start and for unpickling the player pool.
+        """
+        started = set()
+        while len(started) < self.max_workers:
+            started.update(self.executor.map(_pid, range(self.max_workers)))
+
+    def optimize_many(self, tasks: List[dict]) -> List[List[dict]]:
+        """Run ``optimize_pool(**options)`` for every task, in task order."""
+        return list(self.executor.map(_optimize, tasks))
+
+    def get_optimal_lineups(
+        self,
+        dst: Optional[str] = None,
+        one_te: Optional[bool] = False,
+        excluded_players: List[str] = [],
+        included_players: List[str] = [],
+    ) -> List[List[dict]]:
+        return self.optimize_many(
+            [
+                {
+                    "dst": dst,
+                    "one_te": one_te,
+                    "use_avg_fpts": weights[1] > 0,
+                    "weights": {"proj_fpts": weights[0], "avg_fpts": weights[1]},
+                    "excluded_players": excluded_players,
+                    "included_players": included_players,
+                }
+                for weights in [(1, 0), (0.9, 0.1), (0.8, 0.2)]
+            ]
+        )
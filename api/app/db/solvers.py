@@ -0,0 +1,293 @@
+from abc import ABC, abstractmethod
+from math import gcd
+from typing import TYPE_CHECKING, Dict, List, Optional, Tuple, Type
+
+import numpy as np
+import pulp
+from pulp import PULP_CBC_CMD
+from scipy.optimize import Bounds, LinearConstraint, milp
+
+from app.configs.configs import SOLVER_BACKEND
+
+if TYPE_CHECKING:
+    from app.db.model import LineupModel
+
+
+class Solver(ABC):
+    """A solver backend compiled for a single ``LineupModel``.
+
+    Backends are created once per model, keep whatever solver-side
+    representation they need between solves and return a boolean selection mask,
+    or None when the model is infeasible.
+    """
+
+    name: str = ""
+
+    def __init__(self, model: "LineupModel"):
+        self.model = model
+
+    @abstractmethod
+    def set_objective(self, points: np.ndarray) -> None:
+        """Swap in new objective coefficients, ``model.points`` already holds them."""
+
+    @abstractmethod
+    def add_cut(self, selection: np.ndarray, max_overlap: int) -> None:
+        """Add ``sum(x[selection]) <= max_overlap`` to the live model."""
+
+    @abstractmethod
+    def solve(self) -> Optional[np.ndarray]:
+        """Selection mask of the best lineup, None when infeasible."""
+
+
+class CBCSolver(Solver):
+    """PuLP model solved by the CBC binary (one subprocess per solve)."""
+
+    name = "cbc"
+
+    def __init__(self, model: "LineupModel"):
+        super().__init__(model)
+        self.variables: List[pulp.LpVariable] = [
+            pulp.LpVariable(f"Selected_{i}", cat=pulp.LpBinary)
+            for i in range(len(model))
+        ]
+        self.prob = pulp.LpProblem("FantasyFootballOptimization", pulp.LpMaximize)
+        self.prob += self.expression(model.points)
+
+        self.warm_start = False
+        A, lower, upper = model.constraints()
+        for row, row_lower, row_upper in zip(A, lower, upper):
+            expression = self.expression(row)
+            if row_lower == row_upper:
+                self.prob += expression == row_lower
+                continue
+            if np.isfinite(row_lower):
+                self.prob += expression >= row_lower
+            if np.isfinite(row_upper):
+                self.prob += expression <= row_upper
+
+    def expression(self, coefficients: np.ndarray) -> pulp.LpAffineExpression:
+        idx = np.flatnonzero(coefficients)
+        return pulp.LpAffineExpression(
+            zip([self.variables[i] for i in idx], coefficients[idx].tolist())
+        )
+
+    def set_objective(self, points: np.ndarray) -> None:
+        self.prob.setObjective(self.expression(points))
+
+    def add_cut(self, selection: np.ndarray, max_overlap: int) -> None:
+        self.prob += self.expression(selection.astype(np.int64)) <= max_overlap
+        # the previous lineup violates the new cut
+        self.warm_start = False
+
+    def solve(self) -> Optional[np.ndarray]:
+        # varValue still holds the previous lineup, which CBC uses as incumbent
+        self.prob.solve(PULP_CBC_CMD(msg=False, warmStart=self.warm_start))
+        if self.prob.status != pulp.LpStatusOptimal:
+            return None
+        self.warm_start = True
+        return np.array([(v.varValue or 0) > 0.5 for v in self.variables], dtype=bool)
+
+
+class HiGHSSolver(Solver):
+    """In-process HiGHS through ``scipy.optimize.milp``, no subprocess or temp files."""
+
+    name = "highs"
+
+    def __init__(self, model: "LineupModel"):
+        super().__init__(model)
+        A, lower, upper = model.constraints()
+        self.constraints = LinearConstraint(A, lower, upper)
+        self.bounds = Bounds(0, 1)
+        self.integrality = np.ones(len(model))
+
+    def set_objective(self, points: np.ndarray) -> None:
+        # solve reads the objective from the model
+        pass
+
+    def add_cut(self, selection: np.ndarray, max_overlap: int) -> None:
+        # the model already holds the new cut, recompile the constraint matrix
+        A, lower, upper = self.model.constraints()
+        self.constraints = LinearConstraint(A, lower, upper)
+
+    def solve(self) -> Optional[np.ndarray]:
+        res = milp(
+            -self.model.points,
+            constraints=self.constraints,
+            integrality=self.integrality,
+            bounds=self.bounds,
+        )
+        if res.x is None:
+            return None
+        return res.x > 0.5
+
+
+class RosterDPSolver(Solver):
+    """Exact DraftKings roster solver, no generic MILP.
+
+    Salaries are bucketed by their greatest common divisor (100 on DraftKings), a
+    0/1 knapsack with a player-count dimension is run per position, and the
+    positions are then combined with max-plus convolutions over the salary
+    buckets, one layer per position, keeping only the player counts that can
+    still reach a legal roster. The optimum is recovered by backtracking.
+    Pools whose salaries do not bucket finely enough, and models with uniqueness
+    cuts, fall back to CBC.
+    """
+
+    name = "dp"
+    max_buckets = 2000
+
+    def __init__(self, model: "LineupModel"):
+        super().__init__(model)
+        self.fallback: Optional[Solver] = None
+        unit = gcd(model.budget, *model.salary.tolist()) or 1
+        self.capacity = model.budget // unit
+        if self.capacity > self.max_buckets:
+            self.fallback = CBCSolver(model)
+            return
+        self.weights = (model.salary // unit).astype(np.int64)
+
+        # app.db.model imports this module, import its names once both are loaded
+        from app.db.model import POSITIONS
+
+        # per position: players and (lower, upper) counts, the rows of
+        # position_matrix follow POSITIONS whatever order the limits come in
+        self.positions: List[Tuple[np.ndarray, int, int]] = []
+        total = model.total_players
+        limits = [model.position_limits[p] for p in POSITIONS]
+        lowers = [max(lower, 0) for lower, _ in limits]
+        for mask, lower, (_, upper) in zip(model.position_matrix, lowers, limits):
+            players = np.flatnonzero(mask)
+            upper = min(
+                total if upper is None else upper,
+                total - (sum(lowers) - lower),
+                len(players),
+            )
+            self.positions.append((players, lower, upper))
+
+    def set_objective(self, points: np.ndarray) -> None:
+        if self.fallback is not None:
+            self.fallback.set_objective(points)
+
+    def add_cut(self, selection: np.ndarray, max_overlap: int) -> None:
+        if self.fallback is None:
+            # compiled from model.constraints(), which already includes the cut
+            self.fallback = CBCSolver(self.model)
+            return
+        self.fallback.add_cut(selection, max_overlap)
+
+    def knapsack(
+        self, players: np.ndarray, max_count: int
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """best[k, s]: max points of k players with salary <= s buckets."""
+        best = np.full((max_count + 1, self.capacity + 1), -np.inf)
+        best[0] = 0.0
+        take = np.zeros((len(players), max_count + 1, self.capacity + 1), dtype=bool)
+        for i, player in enumerate(players):
+            weight, points = self.weights[player], self.model.points[player]
+            if weight > self.capacity:
+                continue
+            for k in range(min(i + 1, max_count), 0, -1):
+                candidate = best[k - 1, : self.capacity + 1 - weight] + points
+                improved = candidate > best[k, weight:]
+                best[k, weight:][improved] = candidate[improved]
+                take[i, k, weight:] = improved
+        return best, take
+
+    def convolve(self, f: np.ndarray, g: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """Max-plus convolution h[s] = max_a f[a] + g[s - a] and its argmax a."""
+        value = np.full(self.capacity + 1, -np.inf)
+        split = np.zeros(self.capacity + 1, dtype=np.int64)
+        # skip the salary range where either side is still infeasible
+        f_start, g_start = np.argmax(np.isfinite(f)), np.argmax(np.isfinite(g))
+        size = self.capacity + 1 - f_start - g_start
+        if size <= 0 or not np.isfinite(f[f_start]) or not np.isfinite(g[g_start]):
+            return value, split
+
+        # shear f[a] + g[s - a] so that column s holds every split of s
+        sums = np.empty((size, 2 * size))
+        sums[:, size:] = -np.inf
+        np.add(
+            f[f_start : f_start + size, None],
+            g[None, g_start : g_start + size],
+            out=sums[:, :size],
+        )
+        sheared = sums.ravel()[: size * (2 * size - 1)].reshape(size, 2 * size - 1)
+        sheared = sheared[:, :size]
+        best = sheared.argmax(axis=0)
+        value[f_start + g_start :] = sheared[best, np.arange(size)]
+        split[f_start + g_start :] = best + f_start
+        return value, split
+
+    def solve(self) -> Optional[np.ndarray]:
+        if self.fallback is not None:
+            return self.fallback.solve()
+
+        total = self.model.total_players
+        if self.capacity < 0 or total < 0:
+            return None
+
+        # layers[p][c] = (value, count k of position p, salary split), each indexed
+        # by the salary bucket, for c players picked over the first p positions
+        layer = {0: (np.zeros(self.capacity + 1), None, None)}
+        layers, tables = [], []
+        remaining_lower = sum(lower for _, lower, _ in self.positions)
+        remaining_upper = sum(upper for _, _, upper in self.positions)
+        for players, lower, upper in self.positions:
+            best, take = self.knapsack(players, upper)
+            tables.append((players, best, take))
+            remaining_lower -= lower
+            remaining_upper -= upper
+            next_layer = {}
+            for count in range(
+                max(0, total - remaining_upper), total - remaining_lower + 1
+            ):
+                for k in range(lower, upper + 1):
+                    if count - k not in layer:
+                        continue
+                    value, split = self.convolve(layer[count - k][0], best[k])
+                    if count not in next_layer:
+                        next_layer[count] = (value, np.full_like(split, k), split)
+                        continue
+                    current, counts, splits = next_layer[count]
+                    improved = value > current
+                    current[improved] = value[improved]
+                    counts[improved] = k
+                    splits[improved] = split[improved]
+            layers.append(next_layer)
+            layer = next_layer
+
+        if total not in layer or not np.isfinite(layer[total][0][-1]):
+            return None
+
+        # Backtrack through the layers, then through each position's knapsack
+        selection = np.zeros(len(self.model), dtype=bool)
+        count, capacity = total, self.capacity
+        for next_layer, (players, _, take) in zip(reversed(layers), reversed(tables)):
+            _, counts, splits = next_layer[count]
+            k = picked = int(counts[capacity])
+            previous_capacity = int(splits[capacity])
+            position_capacity = capacity - previous_capacity
+            for i in range(len(players) - 1, -1, -1):
+                if k == 0:
+                    break
+                if take[i, k, position_capacity]:
+                    selection[players[i]] = True
+                    position_capacity -= self.weights[players[i]]
+                    k -= 1
+            count -= picked
+            capacity = previous_capacity
+        return selection
+
+
+SOLVERS: Dict[str, Type[Solver]] = {
+    solver.name: solver for solver in [CBCSolver, HiGHSSolver, RosterDPSolver]
+}
+
+
+def get_solver(name: Optional[str] = None) -> Type[Solver]:
+    name = (name or SOLVER_BACKEND).lower()
+    if name not in SOLVERS:
+        raise ValueError(
+            f"Unknown solver backend '{name}'. Expected one of {list(SOLVERS)}"
+        )
+    return SOLVERS[name]
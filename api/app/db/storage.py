@@ -0,0 +1,120 @@
+import argparse
+import glob
+import os
+from typing import Iterable, List, Optional
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.dataset as ds
+import pyarrow.parquet as pq
+
+from app.configs.configs import DATA_DIR, log
+from app.helpers.manifest import parse_year_week
+
+PARQUET_DIR = f"{DATA_DIR}/parquet"
+CSV_PATTERNS = {
+    "projections": "projections/fp_projection_{year}_w{week}.csv",
+    "salaries": "salaries/dk_salary_{year}_w{week}.csv",
+}
+DTYPES = {
+    "projections": {
+        "year": "int32",
+        "week": "int32",
+        "player": "string",
+        "position": "category",
+        "team": "category",
+        "opponent": "category",
+        "grade": "category",
+        "rank": "int32",
+        "avg_fpts": "float64",
+        "proj_fpts": "float64",
+        "salary": "int32",
+    },
+    "salaries": {
+        "player": "string",
+        "position": "category",
+        "team": "category",
+        "opponent": "category",
+        "salary": "int32",
+    },
+}
+
+
+def csv_path(kind: str, year: int, week: int) -> str:
+    return os.path.join(DATA_DIR, CSV_PATTERNS[kind].format(year=year, week=week))
+
+
+def partition_path(kind: str, year: int, week: int) -> str:
+    return f"{PARQUET_DIR}/{kind}/year={year}/week={week}/data.parquet"
+
+
+def dataset_path(kind: str, year: int, week: int) -> str:
+    """Parquet partition of a week if it was written, its CSV otherwise."""
+    path = partition_path(kind, year, week)
+    return path if os.path.exists(path) else csv_path(kind, year, week)
+
+
+def write_partition(df: pd.DataFrame, kind: str, year: int, week: int) -> str:
+    path = partition_path(kind, year, week)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    table = pa.Table.from_pandas(
+        df.astype(DTYPES[kind]), preserve_index=False
+    ).replace_schema_metadata(None)
+    tmp_path = f"{path}.tmp"
+    pq.write_table(table, tmp_path, compression="zstd")
+    os.replace(tmp_path, path)
+    return path
+
+
+def read_table(
+    kind: str, path: str, columns: Optional[List[str]] = None
+) -> pd.DataFrame:
+    """Read one week from a Parquet partition (memory-mapped) or its CSV."""
+    if path.endswith(".parquet"):
+        # partitions are written with DTYPES already, no per-column casts needed
+        return pq.ParquetFile(path, memory_map=True).read(columns=columns).to_pandas()
+    df = pd.read_csv(path, usecols=columns)
+    return df.astype({k: v for k, v in DTYPES[kind].items() if k in df.columns})
+
+
+def read_dataset(
+    kind: str,
+    years: Optional[Iterable[int]] = None,
+    columns: Optional[List[str]] = None,
+) -> pd.DataFrame:
+    """Read every stored week of ``kind`` (optionally only some seasons) at once."""
+    years = ["*"] if years is None else years
+    paths = sorted(
+        (path for year in years for path in glob.glob(partition_path(kind, year, "*"))),
+        # year=YYYY/week=W/data.parquet, in (year, week) order
+        key=lambda path: [int(part.split("=")[1]) for part in path.split("/")[-3:-1]],
+    )
+    if not paths:
+        return pd.DataFrame(columns=columns or list(DTYPES[kind]))
+    return ds.dataset(paths, format="parquet").to_table(columns=columns).to_pandas()
+
+
+def migrate(overwrite: bool = False) -> int:
+    """Write a Parquet partition for every CSV week in DATA_DIR."""
+    migrated = 0
+    for kind, pattern in CSV_PATTERNS.items():
+        pattern = os.path.join(DATA_DIR, pattern.format(year="*", week="*"))
+        for path in sorted(glob.glob(pattern)):
+            year, week = parse_year_week(path)
+            if not overwrite and os.path.exists(partition_path(kind, year, week)):
+                continue
+            write_partition(pd.read_csv(path), kind, year, week)
+            migrated += 1
+            log.info("Migrated %s", path)
+    return migrated
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Migrate the CSV history to partitioned Parquet."
+    )
+    parser.add_argument(
+        "--overwrite", action="store_true", help="rewrite existing partitions"
+    )
+    args = parser.parse_args()
+    log.info("Migrated %s weeks to %s", migrate(overwrite=args.overwrite), PARQUET_DIR)
@@ -0,0 +1,103 @@
+import os
+import threading
+from collections import OrderedDict
+from typing import Tuple
+
+import pandas as pd
+
+from app.configs.configs import PROJECTION_STORE_MAX_BYTES, log
+from app.db.storage import read_table
+from app.helpers.changes import content_hash
+from app.helpers.metrics import span
+
+# (file version, frame size, frame, content hash)
+Entry = Tuple[Tuple[int, int], int, pd.DataFrame, str]
+
+
+def freeze(df: pd.DataFrame) -> pd.DataFrame:
+    """Rebuild ``df`` on read-only arrays so shared frames can't be edited in place."""
+    columns = {}
+    for name, column in df.items():
+        if isinstance(column.dtype, pd.CategoricalDtype):
+            codes = column.cat.codes.to_numpy(copy=True)
+            codes.flags.writeable = False
+            columns[name] = pd.Categorical.from_codes(codes, dtype=column.dtype)
+            continue
+        values = column.to_numpy(copy=True)
+        if values.dtype != object:
+            values.flags.writeable = False
+        columns[name] = pd.array(values, dtype=column.dtype, copy=False)
+    return pd.DataFrame(columns, index=df.index, copy=False)
+
+
+class ProjectionStore:
+    """Process-wide, read-only cache of stored projection files.
+
+    Each file (Parquet partition or CSV) is read once with fixed dtypes and served
+    to every request until its mtime/size change on disk, along with the content
+    hash of the frame. With a memory budget, the least recently used weeks are
+    evicted first. Consumers must treat the frames as immutable.
+    """
+
+    def __init__(self, max_bytes: int = 0):
+        self.max_bytes = max_bytes
+        self.frames: "OrderedDict[str, Entry]" = OrderedDict()
+        self.lock = threading.Lock()
+        self.loads = 0
+        self.hits = 0
+        self.evictions = 0
+
+    @staticmethod
+    def version(path: str) -> Tuple[int, int]:
+        stat = os.stat(path)
+        return stat.st_mtime_ns, stat.st_size
+
+    def get(self, path: str) -> pd.DataFrame:
+        return self.load(path)[2]
+
+    def content_hash(self, path: str) -> str:
+        """sha256 of the stored week's content, see ``changes.content_hash``."""
+        return self.load(path)[3]
+
+    def load(self, path: str) -> Entry:
+        version = self.version(path)
+        with self.lock:
+            entry = self.frames.get(path)
+            if entry is not None and entry[0] == version:
+                self.frames.move_to_end(path)
+                self.hits += 1
+                return entry
+
+            log.info("Loading %s into the projection store", path)
+            with span("load"):
+                df = freeze(read_table("projections", path))
+                size = int(df.memory_usage(deep=True).sum())
+                entry = self.frames[path] = (version, size, df, content_hash(df))
+            self.frames.move_to_end(path)
+            self.loads += 1
+            self.evict()
+            return entry
+
+    def evict(self) -> None:
+        if not self.max_bytes:
+            return
+        total = sum(size for _, size, _, _ in self.frames.values())
+        # always keep the most recently used week, even if it alone is over budget
+        while total > self.max_bytes and len(self.frames) > 1:
+            _, (_, size, _, _) = self.frames.popitem(last=False)
+            total -= size
+            self.evictions += 1
+
+    def stats(self) -> dict:
+        with self.lock:
+            return {
+                "weeks": len(self.frames),
+                "bytes": sum(size for _, size, _, _ in self.frames.values()),
+                "max_bytes": self.max_bytes,
+                "loads": self.loads,
+                "hits": self.hits,
+                "evictions": self.evictions,
+            }
+
+
+projection_store = ProjectionStore(max_bytes=PROJECTION_STORE_MAX_BYTES)
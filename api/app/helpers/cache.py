@@ -0,0 +1,130 @@
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, Iterable, Optional, Tuple
+
+from app.configs.configs import OPTIMIZE_CACHE_SIZE, OPTIMIZE_CACHE_TTL
+
+
+class LineupCache:
+    """Thread-safe LRU + TTL cache for optimizer results.
+
+    Keys embed the (year, week) and the version (content hash) of the projections
+    they were computed from. When a week moves to a new version, ``advance``
+    re-keys the results the change can't affect and drops the rest, so a
+    rewritten projection file only invalidates what it has to, and never touches
+    other weeks.
+    """
+
+    def __init__(self, maxsize: int, ttl: float):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.entries: "OrderedDict[Tuple, Tuple[float, Any]]" = OrderedDict()
+        # (year, week) -> version of the cached entries
+        self.versions: Dict[Tuple[int, int], Hashable] = {}
+        self.lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+        self.carried_over = 0
+
+    @staticmethod
+    def key(
+        endpoint: str,
+        year: int,
+        week: int,
+        version: Hashable,
+        dst: Optional[str] = None,
+        one_te: Optional[bool] = False,
+        excluded_players: Iterable[str] = (),
+        included_players: Iterable[str] = (),
+        **options: Any,
+    ) -> Tuple:
+        return (
+            year,
+            week,
+            version,
+            endpoint,
+            (dst or "").strip().lower(),
+            bool(one_te),
+            tuple(sorted(set(excluded_players))),
+            tuple(sorted(set(included_players))),
+            tuple(sorted(options.items())),
+        )
+
+    def get(self, key: Tuple) -> Optional[Any]:
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry is None or time.monotonic() - entry[0] > self.ttl:
+                if entry is not None:
+                    del self.entries[key]
+                self.misses += 1
+                return None
+            self.entries.move_to_end(key)
+            self.hits += 1
+            return entry[1]
+
+    def put(self, key: Tuple, value: Any) -> None:
+        year, week, version = key[:3]
+        with self.lock:
+            stale = [
+                k for k in self.entries if k[:2] == (year, week) and k[2] != version
+            ]
+            for k in stale:
+                del self.entries[k]
+            self.invalidations += len(stale)
+
+            self.versions[(year, week)] = version
+            self.entries[key] = (time.monotonic(), value)
+            self.entries.move_to_end(key)
+            while len(self.entries) > self.maxsize:
+                self.entries.popitem(last=False)
+                self.evictions += 1
+
+    def version(self, year: int, week: int) -> Optional[Hashable]:
+        with self.lock:
+            return self.versions.get((year, week))
+
+    def advance(
+        self,
+        year: int,
+        week: int,
+        previous: Hashable,
+        version: Hashable,
+        keep: Callable[[Tuple, Any], bool],
+    ) -> None:
+        """Move a week's entries from ``previous`` to ``version``.
+
+        Entries ``keep(key, value)`` accepts are re-keyed to the new version, the
+        others are dropped. A no-op if another request advanced the week first.
+        """
+        with self.lock:
+            if self.versions.get((year, week)) != previous:
+                return
+            self.versions[(year, week)] = version
+            for key in [k for k in self.entries if k[:2] == (year, week)]:
+                stamp, value = self.entries.pop(key)
+                if key[2] == previous and keep(key, value):
+                    self.entries[(year, week, version, *key[3:])] = (stamp, value)
+                    self.carried_over += 1
+                else:
+                    self.invalidations += 1
+
+    def stats(self) -> dict:
+        with self.lock:
+            lookups = self.hits + self.misses
+            return {
+                "size": len(self.entries),
+                "maxsize": self.maxsize,
+                "ttl": self.ttl,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": round(self.hits / lookups, 4) if lookups else 0,
+                "evictions": self.evictions,
+                "invalidations": self.invalidations,
+                "carried_over": self.carried_over,
+            }
+
+
+lineup_cache = LineupCache(maxsize=OPTIMIZE_CACHE_SIZE, ttl=OPTIMIZE_CACHE_TTL)
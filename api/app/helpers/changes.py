@@ -0,0 +1,162 @@
+import hashlib
+import io
+import json
+import os
+import threading
+from datetime import datetime, timezone
+from typing import Iterable, List, Optional
+
+import pandas as pd
+
+from app.configs.configs import DATA_DIR
+
+CHANGES_DIR = f"{DATA_DIR}/changes"
+# players are matched across scrapes by name and position
+KEY = ["player", "position"]
+# changes that can't make a player who wasn't picked worth picking
+HARMLESS = {
+    "rank": lambda old, new: True,
+    "grade": lambda old, new: True,
+    "proj_fpts": lambda old, new: new <= old,
+    "avg_fpts": lambda old, new: new <= old,
+    "salary": lambda old, new: new >= old,
+}
+
+
+def frame_bytes(df: pd.DataFrame) -> bytes:
+    return df.to_csv(index=False).encode()
+
+
+def content_hash(df: pd.DataFrame) -> str:
+    """sha256 of ``df`` as a stored CSV, the same for a week's CSV and Parquet copy."""
+    return hashlib.sha256(frame_bytes(df)).hexdigest()
+
+
+def write_atomic(path: str, data: bytes) -> None:
+    tmp_path = f"{path}.{threading.get_ident()}.tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(data)
+    os.replace(tmp_path, path)
+
+
+def diff_players(old: pd.DataFrame, new: pd.DataFrame) -> List[dict]:
+    """Per-player changes from ``old`` to ``new``, changed fields as [old, new]."""
+    old = old.drop_duplicates(KEY).set_index(KEY)
+    new = new.drop_duplicates(KEY).set_index(KEY)
+    fields = [c for c in new.columns if c in old.columns and c not in ("year", "week")]
+
+    changes = []
+    common = old.index.intersection(new.index, sort=False)
+    before = old.loc[common, fields]
+    after = new.loc[common, fields]
+    moved = (before != after) & ~(before.isna() & after.isna())
+    for (player, position), row in moved[moved.any(axis=1)].iterrows():
+        changes.append(
+            {
+                "player": player,
+                "position": position,
+                "change": "updated",
+                "fields": {
+                    field: [
+                        before.at[(player, position), field],
+                        after.at[(player, position), field],
+                    ]
+                    for field in row.index[row]
+                },
+            }
+        )
+    for change, index in [
+        ("added", new.index.difference(old.index, sort=False)),
+        ("removed", old.index.difference(new.index, sort=False)),
+    ]:
+        changes.extend(
+            {"player": player, "position": position, "change": change}
+            for player, position in index
+        )
+    return json.loads(json.dumps(changes, default=lambda value: value.item()))
+
+
+def write_if_changed(df: pd.DataFrame, path: str) -> Optional[dict]:
+    """Atomically replace the CSV at ``path`` with ``df`` unless nothing changed.
+
+    Returns the change record to publish once the week's other copies are
+    written, None if nothing changed and nothing was written.
+    """
+    data = frame_bytes(df)
+    sha256 = hashlib.sha256(data).hexdigest()
+    try:
+        with open(path, "rb") as f:
+            old_data = f.read()
+    except FileNotFoundError:
+        old_data = None
+    previous = None if old_data is None else hashlib.sha256(old_data).hexdigest()
+    if previous == sha256:
+        return None
+
+    new = pd.read_csv(io.BytesIO(data))
+    old = new.iloc[:0] if old_data is None else pd.read_csv(io.BytesIO(old_data))
+    record = {
+        "previous": previous,
+        "sha256": sha256,
+        "rows": len(df),
+        "changed_at": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "players": diff_players(old, new),
+    }
+    write_atomic(path, data)
+    return record
+
+
+def changes_path(year: int, week: int) -> str:
+    return f"{CHANGES_DIR}/projections_{year}_w{week}.jsonl"
+
+
+def publish_changes(year: int, week: int, record: dict) -> None:
+    """Append a change record to the week's change log read by the API."""
+    os.makedirs(CHANGES_DIR, exist_ok=True)
+    line = json.dumps({"year": int(year), "week": int(week), **record})
+    with open(changes_path(year, week), "a") as f:
+        f.write(line + "\n")
+
+
+def read_changes(year: int, week: int) -> List[dict]:
+    try:
+        with open(changes_path(year, week)) as f:
+            return [json.loads(line) for line in f if line.strip()]
+    except FileNotFoundError:
+        return []
+
+
+def changes_between(
+    year: int, week: int, previous: str, current: str
+) -> Optional[List[dict]]:
+    """Change records leading from content ``previous`` to ``current``.
+
+    None if the log doesn't connect them, e.g. a file written by hand.
+    """
+    chain = []
+    for record in read_changes(year, week):
+        if previous == current:
+            break
+        if record["previous"] == previous:
+            chain.append(record)
+            previous = record["sha256"]
+    return chain if previous == current else None
+
+
+def unaffected(records: Iterable[dict], picked: Iterable[str]) -> bool:
+    """Whether lineups of the ``picked`` players are still the optimal ones.
+
+    True when no picked player changed and every other player was removed or
+    only got worse (fewer points, higher salary) or re-ranked.
+    """
+    picked = set(picked)
+    for record in records:
+        for change in record["players"]:
+            if change["player"] in picked or change["change"] == "added":
+                return False
+            if change["change"] == "removed":
+                continue
+            for field, (old, new) in change["fields"].items():
+                if field not in HARMLESS or not HARMLESS[field](old, new):
+                    return False
+    return True
@@ -0,0 +1,95 @@
+import asyncio
+import time
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from typing import Any, Callable
+
+from app.configs.configs import (
+    OPTIMIZE_MAX_CONCURRENCY,
+    OPTIMIZE_MAX_QUEUE,
+    OPTIMIZE_QUEUE_TIMEOUT,
+)
+
+
+class ExecutorSaturated(Exception):
+    """The wait queue is full, the request was not admitted."""
+
+
+class ExecutorTimeout(Exception):
+    """The request waited longer than the queue timeout for a free slot."""
+
+
+class BoundedExecutor:
+    """Run blocking work off the event loop with bounded concurrency.
+
+    At most ``max_concurrency`` jobs run at once on a dedicated thread pool, up
+    to ``max_queue`` more wait for a slot for at most ``queue_timeout`` seconds,
+    and anything beyond that is rejected right away instead of piling up latency.
+    """
+
+    def __init__(self, max_concurrency: int, max_queue: int, queue_timeout: float):
+        self.max_concurrency = max_concurrency
+        self.max_queue = max_queue
+        self.queue_timeout = queue_timeout
+        self.executor = ThreadPoolExecutor(
+            max_workers=max_concurrency, thread_name_prefix="optimizer"
+        )
+        self.slots = asyncio.Semaphore(max_concurrency)
+        self.running = 0
+        self.waiting = 0
+        self.completed = 0
+        self.rejected = 0
+        self.timed_out = 0
+        self.total_wait = 0.0
+        self.max_wait = 0.0
+
+    async def run(self, func: Callable, *args: Any, **kwargs: Any) -> Any:
+        if self.waiting >= self.max_queue:
+            self.rejected += 1
+            raise ExecutorSaturated(f"{self.waiting} requests already waiting")
+
+        self.waiting += 1
+        start = time.perf_counter()
+        try:
+            await asyncio.wait_for(self.slots.acquire(), timeout=self.queue_timeout)
+        except asyncio.TimeoutError:
+            self.timed_out += 1
+            raise ExecutorTimeout(f"No free slot after {self.queue_timeout}s")
+        finally:
+            self.waiting -= 1
+
+        wait = time.perf_counter() - start
+        self.total_wait += wait
+        self.max_wait = max(self.max_wait, wait)
+        self.running += 1
+        try:
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(
+                self.executor, partial(func, *args, **kwargs)
+            )
+        finally:
+            self.running -= 1
+            self.completed += 1
+            self.slots.release()
+
+    def stats(self) -> dict:
+        admitted = self.completed + self.running
+        return {
+            "max_concurrency": self.max_concurrency,
+            "max_queue": self.max_queue,
+            "queue_timeout": self.queue_timeout,
+            "running": self.running,
+            "waiting": self.waiting,
+            "completed": self.completed,
+            "rejected": self.rejected,
+            "timed_out": self.timed_out,
+            "avg_wait_ms": round(self.total_wait / admitted * 1e3, 2) if admitted else 0,
+            "max_wait_ms": round(self.max_wait * 1e3, 2),
+        }
+
+
+optimize_executor = BoundedExecutor(
+    max_concurrency=OPTIMIZE_MAX_CONCURRENCY,
+    max_queue=OPTIMIZE_MAX_QUEUE,
+    queue_timeout=OPTIMIZE_QUEUE_TIMEOUT,
+)
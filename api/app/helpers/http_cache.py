@@ -0,0 +1,245 @@
+import hashlib
+import json
+import os
+import re
+import threading
+import time
+from typing import Dict, List, Optional, Tuple
+
+import requests
+
+from app.configs.configs import HTTP_CACHE_DIR, HTTP_CACHE_MAX_BYTES, HTTP_CACHE_MODE
+
+# (url pattern, seconds) pairs, the first match wins. Stats for finished weeks
+# barely change, rankings move until kickoff, so they are revalidated often.
+TTL_POLICIES: List[Tuple[str, float]] = [
+    (r"/nfl/stats/", 24 * 3600),
+    (r"/nfl/reports/leaders/", 3600),
+    (r"/nfl/rankings/", 900),
+]
+DEFAULT_TTL = 900.0
+
+
+class CacheMiss(Exception):
+    """Replay mode was asked for a response that was never recorded."""
+
+
+class HTTPCache:
+    """Content-addressed, size-bounded on-disk cache of GET responses.
+
+    Bodies live under ``objects/<sha256>`` (identical pages are stored once)
+    and per-request metadata under ``entries/<key>.json``. Entries are served
+    without a request while fresh per ``TTL_POLICIES``, and revalidated with
+    If-None-Match / If-Modified-Since once they expire. The least recently used
+    entries are dropped past ``max_bytes``, checked against a running total of
+    the stored bodies instead of re-reading every entry on each miss.
+
+    ``mode`` is "online" (default), "replay" (serve recorded responses only,
+    never touch the network) or "off".
+    """
+
+    def __init__(
+        self,
+        directory: str,
+        max_bytes: int,
+        mode: str = "online",
+        policies: Optional[List[Tuple[str, float]]] = None,
+    ):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.mode = mode
+        self.policies = [
+            (re.compile(pattern), ttl)
+            for pattern, ttl in (TTL_POLICIES if policies is None else policies)
+        ]
+        self.lock = threading.Lock()
+        # key -> sha256 of each entry and sha256 -> [size, entries] of each body,
+        # read from disk on first use; size is the total of the bodies
+        self.index: Optional[Dict[str, str]] = None
+        self.objects: Dict[str, List[int]] = {}
+        self.size = 0
+        self.hits = 0
+        self.revalidated = 0
+        self.misses = 0
+
+    @staticmethod
+    def key(url: str, params: Optional[dict]) -> str:
+        # requests drops None params, so they must not change the key either
+        params = sorted(
+            (k, str(v)) for k, v in (params or {}).items() if v is not None
+        )
+        return hashlib.sha256(json.dumps([url, params]).encode()).hexdigest()
+
+    def ttl(self, url: str) -> float:
+        for pattern, ttl in self.policies:
+            if pattern.search(url):
+                return ttl
+        return DEFAULT_TTL
+
+    def entry_path(self, key: str) -> str:
+        return os.path.join(self.directory, "entries", f"{key}.json")
+
+    def object_path(self, digest: str) -> str:
+        return os.path.join(self.directory, "objects", digest)
+
+    def load(self, key: str) -> Optional[Tuple[dict, bytes]]:
+        try:
+            with open(self.entry_path(key)) as f:
+                entry = json.load(f)
+            with open(self.object_path(entry["sha256"]), "rb") as f:
+                return entry, f.read()
+        except (FileNotFoundError, json.JSONDecodeError):
+            return None
+
+    def write(self, path: str, data: bytes) -> None:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp_path = f"{path}.{threading.get_ident()}.tmp"
+        with open(tmp_path, "wb") as f:
+            f.write(data)
+        os.replace(tmp_path, path)
+
+    def store(self, key: str, entry: dict, body: Optional[bytes] = None) -> None:
+        digest = entry["sha256"]
+        if body is not None and not os.path.exists(self.object_path(digest)):
+            self.write(self.object_path(digest), body)
+        self.write(self.entry_path(key), json.dumps(entry).encode())
+        with self.lock:
+            if self.index is None:
+                self.rebuild()
+            elif self.index.get(key) != digest:
+                if key in self.index:
+                    self.release(self.index[key])
+                self.index[key] = digest
+                self.reference(digest, entry["size"])
+
+    def reference(self, digest: str, size: int) -> None:
+        body = self.objects.setdefault(digest, [size, 0])
+        if not body[1]:
+            self.size += size
+        body[1] += 1
+
+    def release(self, digest: str) -> bool:
+        # True once no entry refers to the body anymore
+        body = self.objects[digest]
+        body[1] -= 1
+        if body[1]:
+            return False
+        self.size -= body[0]
+        del self.objects[digest]
+        return True
+
+    def rebuild(self) -> List[Tuple[float, str, str]]:
+        """Re-read the index from disk, return (mtime, key, sha256) per entry."""
+        self.index, self.objects, self.size = {}, {}, 0
+        entries = []
+        directory = os.path.join(self.directory, "entries")
+        names = os.listdir(directory) if os.path.isdir(directory) else []
+        for name in names:
+            if not name.endswith(".json"):
+                continue
+            path = os.path.join(directory, name)
+            try:
+                with open(path) as f:
+                    entry = json.load(f)
+                mtime = os.path.getmtime(path)
+            except (FileNotFoundError, json.JSONDecodeError):
+                continue
+            key = name[: -len(".json")]
+            self.index[key] = entry["sha256"]
+            self.reference(entry["sha256"], entry["size"])
+            entries.append((mtime, key, entry["sha256"]))
+        return entries
+
+    def get(
+        self,
+        url: str,
+        params: Optional[dict] = None,
+        session=requests,
+        **kwargs,
+    ) -> str:
+        """Body of ``GET url?params`` as text, from the cache when possible."""
+        if self.mode == "off":
+            r = session.get(url, params=params, **kwargs)
+            r.raise_for_status()
+            return r.text
+
+        key = self.key(url, params)
+        cached = self.load(key)
+        if self.mode == "replay":
+            if cached is None:
+                raise CacheMiss(f"{url} {params} was not recorded")
+            return cached[1].decode(cached[0]["encoding"], errors="replace")
+
+        if cached is not None:
+            entry, body = cached
+            if time.time() - entry["fetched_at"] < self.ttl(url):
+                with self.lock:
+                    self.hits += 1
+                os.utime(self.entry_path(key))
+                return body.decode(entry["encoding"], errors="replace")
+
+            headers = {}
+            if entry.get("etag"):
+                headers["If-None-Match"] = entry["etag"]
+            if entry.get("last_modified"):
+                headers["If-Modified-Since"] = entry["last_modified"]
+            r = session.get(url, params=params, headers=headers, **kwargs)
+            if r.status_code == 304:
+                with self.lock:
+                    self.revalidated += 1
+                entry["fetched_at"] = time.time()
+                self.store(key, entry)
+                return body.decode(entry["encoding"], errors="replace")
+        else:
+            r = session.get(url, params=params, **kwargs)
+
+        r.raise_for_status()
+        with self.lock:
+            self.misses += 1
+        body = r.content
+        encoding = r.encoding or r.apparent_encoding or "utf-8"
+        entry = {
+            "url": url,
+            "params": params,
+            "sha256": hashlib.sha256(body).hexdigest(),
+            "size": len(body),
+            "encoding": encoding,
+            "etag": r.headers.get("ETag"),
+            "last_modified": r.headers.get("Last-Modified"),
+            "fetched_at": time.time(),
+        }
+        self.store(key, entry, body)
+        self.evict()
+        return body.decode(encoding, errors="replace")
+
+    def evict(self) -> None:
+        with self.lock:
+            if self.size <= self.max_bytes:
+                return
+            # other processes share the directory, so resync before deleting
+            entries = self.rebuild()
+            # least recently used first, hits touch the entry's mtime
+            for _, key, digest in sorted(entries):
+                if self.size <= self.max_bytes:
+                    break
+                try:
+                    os.remove(self.entry_path(key))
+                except FileNotFoundError:
+                    pass
+                del self.index[key]
+                if self.release(digest):
+                    try:
+                        os.remove(self.object_path(digest))
+                    except FileNotFoundError:
+                        pass
+
+    def stats(self) -> dict:
+        return {
+            "mode": self.mode,
+            "hits": self.hits,
+            "revalidated": self.revalidated,
+            "misses": self.misses,
+        }
+
+
+http_cache = HTTPCache(HTTP_CACHE_DIR, HTTP_CACHE_MAX_BYTES, mode=HTTP_CACHE_MODE)
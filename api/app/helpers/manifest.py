@@ -0,0 +1,180 @@
+import argparse
+import fcntl
+import glob
+import hashlib
+import json
+import os
+import re
+import threading
+import time
+from datetime import datetime, timezone
+from typing import Dict, Optional, Tuple
+
+from app.configs.configs import DATA_DIR, MANIFEST_REFRESH_INTERVAL, log
+
+MANIFEST_PATH = f"{DATA_DIR}/manifest.json"
+DATASET_PATTERNS = {
+    "salaries": "salaries/dk_salary_*_w*.csv",
+    "projections": "projections/fp_projection_*_w*.csv",
+}
+
+
+def dataset_entry(year: int, week: int, path: str, rows: int) -> dict:
+    with open(path, "rb") as f:
+        sha256 = hashlib.sha256(f.read()).hexdigest()
+    return {
+        "year": int(year),
+        "week": int(week),
+        "file": os.path.relpath(path, DATA_DIR),
+        "rows": int(rows),
+        "sha256": sha256,
+        "updated_at": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+    }
+
+
+def write_manifest(update) -> None:
+    # scrapers can run concurrently, serialize the read-modify-write
+    with open(f"{MANIFEST_PATH}.lock", "w") as lock:
+        fcntl.flock(lock, fcntl.LOCK_EX)
+        try:
+            with open(MANIFEST_PATH) as f:
+                manifest = json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError):
+            # a new manifest starts from the weeks already on disk, not just
+            # the one being written
+            manifest = {"datasets": scan_datasets()}
+        update(manifest)
+        tmp_path = f"{MANIFEST_PATH}.tmp"
+        with open(tmp_path, "w") as f:
+            json.dump(manifest, f, indent=2, sort_keys=True)
+        os.replace(tmp_path, MANIFEST_PATH)
+
+
+def update_manifest(kind: str, year: int, week: int, path: str, rows: int) -> None:
+    """Record a written dataset in the shared data manifest."""
+    entry = dataset_entry(year, week, path, rows)
+    write_manifest(
+        lambda manifest: manifest["datasets"]
+        .setdefault(kind, {})
+        .update({f"{year}_w{week}": entry})
+    )
+
+
+def parse_year_week(path: str) -> Optional[Tuple[int, int]]:
+    match = re.search(r"_(\d{4})_w(\d+)\.", os.path.basename(path))
+    return (int(match.group(1)), int(match.group(2))) if match else None
+
+
+def scan_datasets() -> Dict[str, Dict[str, dict]]:
+    """Manifest entries of the datasets in DATA_DIR, from their file names."""
+    datasets = {}
+    for kind, pattern in DATASET_PATTERNS.items():
+        datasets[kind] = {}
+        for path in glob.glob(os.path.join(DATA_DIR, pattern)):
+            if (year_week := parse_year_week(path)) is not None:
+                datasets[kind][f"{year_week[0]}_w{year_week[1]}"] = {
+                    "year": year_week[0],
+                    "week": year_week[1],
+                    "file": os.path.relpath(path, DATA_DIR),
+                }
+    return datasets
+
+
+def rebuild_manifest() -> None:
+    """Index every dataset already in DATA_DIR, e.g. history from before the manifest."""
+
+    def update(manifest: dict) -> None:
+        for kind, pattern in DATASET_PATTERNS.items():
+            datasets = manifest["datasets"].setdefault(kind, {})
+            for path in glob.glob(os.path.join(DATA_DIR, pattern)):
+                if (year_week := parse_year_week(path)) is None:
+                    continue
+                with open(path, "rb") as f:
+                    rows = max(sum(1 for _ in f) - 1, 0)
+                datasets[f"{year_week[0]}_w{year_week[1]}"] = dataset_entry(
+                    *year_week, path, rows
+                )
+
+    write_manifest(update)
+
+
+class DataManifest:
+    """In-memory view of the data manifest.
+
+    The manifest file is stat'ed at most once per ``refresh_interval`` seconds
+    and only re-parsed when it changed, so resolving datasets doesn't touch the
+    filesystem per request. Its entries are laid over an index of the file names
+    on disk, so weeks missing from the manifest are still found; without a
+    manifest that index is rebuilt once per interval.
+    """
+
+    def __init__(self, path: str, refresh_interval: float):
+        self.path = path
+        self.refresh_interval = refresh_interval
+        self.lock = threading.Lock()
+        self.checked_at = float("-inf")
+        self.version: Optional[Tuple[int, int]] = None
+        self.datasets: Dict[str, Dict[Tuple[int, int], dict]] = {}
+
+    def refresh(self) -> None:
+        try:
+            stat = os.stat(self.path)
+        except FileNotFoundError:
+            self.version = None
+            self.datasets = self.scan()
+            return
+        version = (stat.st_mtime_ns, stat.st_size)
+        if version == self.version:
+            return
+        with open(self.path) as f:
+            manifest = json.load(f)
+        datasets = self.scan()
+        for kind, entries in manifest.get("datasets", {}).items():
+            datasets.setdefault(kind, {}).update(
+                {(entry["year"], entry["week"]): entry for entry in entries.values()}
+            )
+        self.datasets = datasets
+        self.version = version
+        log.info("Loaded data manifest %s", self.path)
+
+    @staticmethod
+    def scan() -> Dict[str, Dict[Tuple[int, int], dict]]:
+        return {
+            kind: {(entry["year"], entry["week"]): entry for entry in entries.values()}
+            for kind, entries in scan_datasets().items()
+        }
+
+    def get(self, kind: str) -> Dict[Tuple[int, int], dict]:
+        with self.lock:
+            now = time.monotonic()
+            if now - self.checked_at >= self.refresh_interval:
+                self.checked_at = now
+                self.refresh()
+            return self.datasets.get(kind, {})
+
+    def latest(
+        self, kind: str, year: Optional[int] = None
+    ) -> Optional[Tuple[int, int]]:
+        keys = [key for key in self.get(kind) if year is None or key[0] == year]
+        return max(keys) if keys else None
+
+
+data_manifest = DataManifest(MANIFEST_PATH, refresh_interval=MANIFEST_REFRESH_INTERVAL)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Data manifest maintenance.")
+    parser.add_argument(
+        "--rebuild", action="store_true", help="index every dataset in DATA_DIR"
+    )
+    args = parser.parse_args()
+    if args.rebuild:
+        rebuild_manifest()
+    manifest = DataManifest(MANIFEST_PATH, refresh_interval=0)
+    for kind in DATASET_PATTERNS:
+        log.info(
+            "%s: %s datasets, latest %s",
+            kind,
+            len(manifest.get(kind)),
+            manifest.latest(kind),
+        )
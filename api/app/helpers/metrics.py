@@ -0,0 +1,181 @@
+import threading
+import time
+from bisect import bisect_left
+from typing import Callable, Dict, List, Sequence, Tuple
+
+# Upper bounds (seconds) of the latency buckets, +Inf is implied
+BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5)
+
+
+def escape(value: str) -> str:
+    return value.replace("\\", r"\\").replace("\n", r"\n").replace('"', r"\"")
+
+
+def format_labels(names: Sequence[str], values: Sequence[str], **extra: str) -> str:
+    pairs = list(zip(names, values)) + list(extra.items())
+    if not pairs:
+        return ""
+    return "{" + ",".join(f'{name}="{escape(str(v))}"' for name, v in pairs) + "}"
+
+
+class Counter:
+    def __init__(self, name: str, help: str, labels: Sequence[str] = ()):
+        self.name = name
+        self.help = help
+        self.labels = tuple(labels)
+        self.values: Dict[Tuple[str, ...], float] = {}
+        self.lock = threading.Lock()
+
+    def inc(self, *labels: str, amount: float = 1) -> None:
+        with self.lock:
+            self.values[labels] = self.values.get(labels, 0) + amount
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} counter"]
+        with self.lock:
+            values = sorted(self.values.items())
+        for labels, value in values:
+            lines.append(f"{self.name}{format_labels(self.labels, labels)} {value:g}")
+        return lines
+
+
+class Histogram:
+    """Latency histogram, one set of bucket counts per label combination.
+
+    ``observe`` is a bisect and a few increments under a lock, cheap enough for
+    every request. Counts are made cumulative only when rendered.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        help: str,
+        labels: Sequence[str] = (),
+        buckets: Sequence[float] = BUCKETS,
+    ):
+        self.name = name
+        self.help = help
+        self.labels = tuple(labels)
+        self.buckets = tuple(buckets)
+        # labels -> [bucket counts incl. +Inf, sum, count]
+        self.series: Dict[Tuple[str, ...], list] = {}
+        self.lock = threading.Lock()
+
+    def observe(self, value: float, *labels: str) -> None:
+        i = bisect_left(self.buckets, value)
+        with self.lock:
+            series = self.series.get(labels)
+            if series is None:
+                series = self.series[labels] = [[0] * (len(self.buckets) + 1), 0.0, 0]
+            series[0][i] += 1
+            series[1] += value
+            series[2] += 1
+
+    def time(self, *labels: str) -> "Timer":
+        return Timer(self, labels)
+
+    def total(self, *labels: str) -> float:
+        """Sum of the values observed with ``labels`` so far."""
+        with self.lock:
+            series = self.series.get(labels)
+            return series[1] if series else 0.0
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} histogram"]
+        with self.lock:
+            series = sorted(
+                (labels, (list(counts), total, count))
+                for labels, (counts, total, count) in self.series.items()
+            )
+        for labels, (counts, total, count) in series:
+            cumulative = 0
+            for bound, n in zip(self.buckets + (float("inf"),), counts):
+                cumulative += n
+                le = "+Inf" if bound == float("inf") else f"{bound:g}"
+                lines.append(
+                    f"{self.name}_bucket{format_labels(self.labels, labels, le=le)} "
+                    f"{cumulative}"
+                )
+            label_text = format_labels(self.labels, labels)
+            lines.append(f"{self.name}_sum{label_text} {total:.6f}")
+            lines.append(f"{self.name}_count{label_text} {count}")
+        return lines
+
+
+class Timer:
+    """Context manager observing its elapsed time into a histogram."""
+
+    __slots__ = ("histogram", "labels", "start")
+
+    def __init__(self, histogram: Histogram, labels: Tuple[str, ...]):
+        self.histogram = histogram
+        self.labels = labels
+
+    def __enter__(self) -> "Timer":
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.histogram.observe(time.perf_counter() - self.start, *self.labels)
+
+
+class Registry:
+    """Metrics of this process, rendered in the Prometheus text format.
+
+    Besides counters and histograms, ``collect`` exposes the numeric fields of an
+    existing ``stats()`` dict as gauges, read at scrape time.
+    """
+
+    def __init__(self):
+        self.metrics: list = []
+        self.collectors: List[Tuple[str, str, Callable[[], dict]]] = []
+
+    def counter(self, name: str, help: str, labels: Sequence[str] = ()) -> Counter:
+        metric = Counter(name, help, labels)
+        self.metrics.append(metric)
+        return metric
+
+    def histogram(
+        self, name: str, help: str, labels: Sequence[str] = (), **kwargs
+    ) -> Histogram:
+        metric = Histogram(name, help, labels, **kwargs)
+        self.metrics.append(metric)
+        return metric
+
+    def collect(self, prefix: str, help: str, stats: Callable[[], dict]) -> None:
+        self.collectors.append((prefix, help, stats))
+
+    def render(self) -> str:
+        lines = []
+        for metric in self.metrics:
+            lines.extend(metric.render())
+        for prefix, help, stats in self.collectors:
+            for key, value in stats().items():
+                if isinstance(value, bool) or not isinstance(value, (int, float)):
+                    continue
+                name = f"{prefix}_{key}"
+                lines.append(f"# HELP {name} {help}")
+                lines.append(f"# TYPE {name} gauge")
+                lines.append(f"{name} {value:g}")
+        return "\n".join(lines) + "\n"
+
+
+registry = Registry()
+# Stages of the optimizer hot path: load (projection store misses only), filter,
+# build, solve, serialize
+span_seconds = registry.histogram(
+    "dfs_span_seconds", "Time spent in a stage of a request.", ["span"]
+)
+request_seconds = registry.histogram(
+    "dfs_request_seconds", "HTTP request latency.", ["method", "route"]
+)
+requests_total = registry.counter(
+    "dfs_requests_total",
+    "HTTP requests by response status.",
+    ["method", "route", "status"],
+)
+
+
+def span(name: str) -> Timer:
+    """``with span("solve"):`` adds the block's time to ``dfs_span_seconds``."""
+    return span_seconds.time(name)
@@ -1,70 +1,22 @@
-import glob
-import json
-import os
-import re
-from io import StringIO
 from typing import List, Optional, Tuple
 
-import bs4 as bs
-import pandas as pd
-import requests
-
 from app.configs.configs import STATS_COLUMN_MAPPINGS
+from app.helpers.http_cache import http_cache
+from app.helpers.manifest import data_manifest
+from app.helpers.parsers import parse_data_table, parse_rankings
 
 
 def get_latest_week(year: Optional[int] = None) -> int:
-    pattern = f"/app/data/salaries/dk_salary_{year if year else '*'}_w*.csv"
-    files = glob.glob(pattern)
-    if not files:
-        return 1
-    latest_file = max(files, key=os.path.getctime)
-    week_number = latest_file.split("_w")[-1].split(".")[0]
-    return int(week_number)
+    # latest (year, week) with salaries, resolved from the in-memory manifest
+    latest = data_manifest.latest("salaries", year=year)
+    return latest[1] if latest else 1
 
 
 def get_weekly_rankings(position: str, year: int, week: int):
-    rankings_list = []
     position = position.upper()
     url = f"https://www.fantasypros.com/nfl/rankings/{'ppr-' if position not in ['QB', 'DST'] else ''}{position.lower()}.php"
     params = {"year": year, "week": week}
-    r = requests.get(url, params=params)
-    cxt = bs.BeautifulSoup(r.text, features="lxml")
-    script_tags = cxt.find_all("script", attrs={"type": "text/javascript"})
-    for script_tag in script_tags:
-        script_text = script_tag.text.strip()
-        if "var ecrData =" in script_text:
-            ecrData_match = re.search(r"var ecrData = (.*?});", script_text)
-            if ecrData_match:
-                players = json.loads(ecrData_match.group(1))["players"]
-                for player in players:
-                    try:
-                        player_name = player["player_name"]
-                        position = player["player_position_id"]
-                        rank = player["rank_ecr"]
-                        rank_min = player["rank_min"]
-                        rank_max = player["rank_max"]
-                        rank_avg = player["rank_ave"]
-                        rank_std = player["rank_std"]
-                        grade = player["start_sit_grade"]
-                        fpts = player.get("r2p_pts", 0.0)
-                        rankings_list.append(
-                            {
-                                "player": str(player_name),
-                                "position": str(position),
-                                "year": int(year),
-                                "week": int(week),
-                                "rank": int(rank),
-                                "min_rank": int(rank_min),
-                                "max_rank": int(rank_max),
-                                "avg_rank": float(rank_avg),
-                                "std_rank": float(rank_std),
-                                "grade": str(grade),
-                                "proj_fpts": float(fpts),
-                            }
-                        )
-                    except:
-                        pass
-    return pd.DataFrame(rankings_list)
+    return parse_rankings(http_cache.get(url, params), year, week)
 
 
 def get_stats(
@@ -90,8 +42,8 @@ def get_stats(
         "end_week": end,
         "scoring": scoring,
     }
-    r = requests.get(url, params=params)
-    df = pd.io.html.read_html(StringIO(r.text), attrs={"id": "data"})[0].iloc[:, 1:]
+    html = http_cache.get(url, params)
+    df = parse_data_table(html, STATS_COLUMN_MAPPINGS[position], skip=1)
     df.columns = [
         (
             f"avg_{col}"
@@ -119,7 +71,6 @@ def get_stats(
     df["position"] = position
     df["season"] = year
     df["week"] = end + 1
-    df["rost"] = df.rost.str.strip("%").astype(float)
     df[[col for col in df.columns if (("avg" in col) and (col != "avg_fpts"))]] = (
         df[[col for col in df.columns if (("avg" in col) and (col != "avg_fpts"))]]
         .div(df["games"], axis=0)
@@ -1,6 +1,6 @@
 from typing import List, Optional
 
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
 
 
 class OptimizeRequest(BaseModel):
@@ -10,3 +10,8 @@ class OptimizeRequest(BaseModel):
     one_te: Optional[bool] = False
     excluded_players: List[str] = []
     included_players: List[str] = []
+
+
+class UniqueLineupsRequest(OptimizeRequest):
+    num_lineups: int = Field(default=20, ge=1, le=150)
+    min_unique: int = Field(default=1, ge=1, le=9)
@@ -1,3 +1,11 @@
 from typing import List
 
+from pydantic import BaseModel
+
 OptimizeResponse = List[List[dict]]
+
+
+class UniqueLineupsResponse(BaseModel):
+    lineups: List[List[dict]]
+    # time spent on each additional lineup, in ms
+    solve_times: List[float]
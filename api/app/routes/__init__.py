@@ -1,3 +1,4 @@
+from app.routes.metrics import router as metrics_router
 from app.routes.optimize import router as optimize_router
 from app.routes.projections import router as projections_router
 from fastapi import APIRouter
@@ -6,3 +7,4 @@ from fastapi.responses import ORJSONResponse
 api_router = APIRouter(default_response_class=ORJSONResponse)
 api_router.include_router(optimize_router, prefix="/optimize")
 api_router.include_router(projections_router, prefix="/projections")
+api_router.include_router(metrics_router, prefix="/metrics")
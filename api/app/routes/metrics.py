@@ -0,0 +1,30 @@
+from fastapi.responses import PlainTextResponse
+
+from app.db.store import projection_store
+from app.helpers.api_router import APIRouter
+from app.helpers.cache import lineup_cache
+from app.helpers.executor import optimize_executor
+from app.helpers.metrics import registry
+
+router = APIRouter()
+
+registry.collect(
+    "dfs_optimizer_queue", "Optimizer executor stats.", optimize_executor.stats
+)
+registry.collect("dfs_lineup_cache", "Optimize result cache stats.", lineup_cache.stats)
+registry.collect(
+    "dfs_projection_store", "In-memory projection store stats.", projection_store.stats
+)
+
+
+@router.get(
+    "/",
+    summary="Get metrics",
+    response_class=PlainTextResponse,
+    description="Endpoint for request and optimizer stage latency histograms, "
+    "counters and queue/cache/store gauges in the Prometheus text format.",
+)
+async def metrics():
+    return PlainTextResponse(
+        registry.render(), media_type="text/plain; version=0.0.4; charset=utf-8"
+    )
@@ -1,13 +1,77 @@
+from typing import Any, Callable, Set
+
 from fastapi import HTTPException, status
 
 from app.db.optimize import DFSLineupOptimizer
 from app.helpers.api_router import APIRouter
-from app.models.requests.optimize import OptimizeRequest
-from app.models.responses.optimize import OptimizeResponse
+from app.helpers.cache import lineup_cache
+from app.helpers.changes import changes_between, unaffected
+from app.helpers.executor import ExecutorSaturated, ExecutorTimeout, optimize_executor
+from app.models.requests.optimize import OptimizeRequest, UniqueLineupsRequest
+from app.models.responses.optimize import OptimizeResponse, UniqueLineupsResponse
 
 router = APIRouter()
 
 
+async def run_optimizer(func: Callable, *args: Any, **kwargs: Any) -> Any:
+    # blocking pandas + solver work runs on the bounded optimizer executor
+    try:
+        return await optimize_executor.run(func, *args, **kwargs)
+    except ExecutorSaturated as e:
+        raise HTTPException(
+            status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+            detail=str(e),
+            headers={"Retry-After": "1"},
+        )
+    except ExecutorTimeout as e:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail=str(e),
+            headers={"Retry-After": "1"},
+        )
+
+
+def picked_players(endpoint: str, result: Any) -> Set[str]:
+    lineups = result[0] if endpoint == "lineups" else result
+    return {player["player"] for lineup in lineups for player in lineup}
+
+
+def advance_cache(year: int, week: int, version: str) -> None:
+    # carry cached results over projection changes that can't alter them
+    previous = lineup_cache.version(year, week)
+    if previous is None or previous == version:
+        return
+    records = changes_between(year, week, previous, version)
+    lineup_cache.advance(
+        year,
+        week,
+        previous,
+        version,
+        lambda key, result: records is not None
+        and unaffected(records, picked_players(key[3], result)),
+    )
+
+
+def cached_run(endpoint: str, method: str, data: OptimizeRequest) -> Any:
+    # results are cached per request options and projection content
+    optimizer = DFSLineupOptimizer(year=data.year, week=data.week)
+    options = data.model_dump(exclude={"year", "week"})
+    year, week = optimizer.current_year, optimizer.current_week
+    version = optimizer.get_projections_version()
+    advance_cache(year, week, version)
+    key = lineup_cache.key(endpoint, year, week, version, **options)
+    if (result := lineup_cache.get(key)) is None:
+        result = getattr(optimizer, method)(use_stored_data=True, **options)
+        lineup_cache.put(key, result)
+    return result
+
+
+async def cached_optimizer(endpoint: str, method: str, data: OptimizeRequest) -> Any:
+    # the version lookup can load and hash the week and advance_cache reads the
+    # change log, so the whole lookup runs on the executor with the solve
+    return await run_optimizer(cached_run, endpoint, method, data)
+
+
 @router.post(
     "/",
     summary="Get optimized lineups",
@@ -17,15 +81,46 @@ router = APIRouter()
 async def optimize(data: OptimizeRequest):
     # get optimal lineups
     try:
-        optimizer = DFSLineupOptimizer(year=data.year, week=data.week)
-        if lineups := optimizer.get_optimal_lineups(
-            dst=data.dst,
-            one_te=data.one_te,
-            excluded_players=data.excluded_players,
-            included_players=data.included_players,
-            use_stored_data=True,
-        ):
+        if lineups := await cached_optimizer("optimize", "get_optimal_lineups", data):
             return lineups
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND)
     except FileNotFoundError as e:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=str(e))
+
+
+@router.post(
+    "/lineups",
+    summary="Get many unique lineups",
+    response_model=UniqueLineupsResponse,
+    description="Endpoint for generating N optimized DFS lineups that differ by at "
+    "least `min_unique` players from each other.",
+)
+async def unique_lineups(data: UniqueLineupsRequest):
+    try:
+        lineups, solve_times = await cached_optimizer(
+            "lineups", "get_unique_lineups", data
+        )
+        if lineups:
+            return UniqueLineupsResponse(lineups=lineups, solve_times=solve_times)
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND)
+    except FileNotFoundError as e:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=str(e))
+
+
+@router.get(
+    "/queue",
+    summary="Get optimizer queue stats",
+    description="Endpoint for the optimizer executor's concurrency, queue depth "
+    "and wait times.",
+)
+async def queue_stats():
+    return optimize_executor.stats()
+
+
+@router.get(
+    "/cache",
+    summary="Get optimizer cache stats",
+    description="Endpoint for the optimize result cache's size and hit/miss counters.",
+)
+async def cache_stats():
+    return lineup_cache.stats()
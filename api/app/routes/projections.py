@@ -1,6 +1,8 @@
 from app.configs.configs import log
 from app.db.optimize import DFSLineupOptimizer
+from app.db.store import projection_store
 from app.helpers.api_router import APIRouter
+from app.helpers.metrics import span
 from app.models.responses.projections import GetProjectionsResponse
 from app.models.requests.projections import GetProjectionsRequest
 from fastapi import HTTPException, status
@@ -19,6 +21,16 @@ async def get_projections(data: GetProjectionsRequest):
     optimizer = DFSLineupOptimizer(week=data.week)
     try:
         df = optimizer.get_projections_df(use_stored_data=True)
-        return df.to_dict(orient="records")
+        with span("serialize"):
+            return df.to_dict(orient="records")
     except Exception as e:
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+
+
+@router.get(
+    "/store",
+    summary="Get projection store stats",
+    description="Endpoint for the in-memory projection store's size, loads and evictions.",
+)
+async def get_store_stats():
+    return projection_store.stats()
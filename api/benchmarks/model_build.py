@@ -0,0 +1,97 @@
+"""Model construction benchmark over the stored projection weeks.
+
+Compares the original per-row ``opt_df.loc`` PuLP construction with the
+array-backed ``LineupModel`` builder. Only build time is measured, CBC is not run.
+
+    cd api && DATA_DIR=../data python -m benchmarks.model_build
+"""
+import argparse
+import glob
+import os
+import time
+
+import pandas as pd
+import pulp
+
+from app.configs.configs import DATA_DIR
+from app.db.model import LineupModel
+from app.db.storage import csv_path
+
+POSITION_LIMITS = {
+    "QB": (1, 1),
+    "RB": (2, None),
+    "WR": (3, None),
+    "TE": (1, None),
+    "DST": (1, 1),
+}
+
+
+def build_legacy(opt_df: pd.DataFrame) -> pulp.LpProblem:
+    prob = pulp.LpProblem("FantasyFootballOptimization", pulp.LpMaximize)
+    selected_vars = pulp.LpVariable.dicts("Selected", opt_df.index, cat="Binary")
+    prob += pulp.lpSum(
+        opt_df.loc[i, "proj_fpts"] * selected_vars[i] for i in opt_df.index
+    )
+    prob += pulp.lpSum(selected_vars[i] for i in opt_df.index) == 9
+    prob += (
+        pulp.lpSum(opt_df.loc[i, "salary"] * selected_vars[i] for i in opt_df.index)
+        <= 50000
+    )
+    for position, (lower, upper) in POSITION_LIMITS.items():
+        players = pulp.lpSum(
+            selected_vars[i]
+            for i in opt_df.index
+            if opt_df.loc[i, "position"] == position
+        )
+        prob += (players == lower) if lower == upper else (players >= lower)
+    return prob
+
+
+def build_array(opt_df: pd.DataFrame) -> pulp.LpProblem:
+    return LineupModel(
+        opt_df,
+        budget=50000,
+        total_players=9,
+        position_limits=POSITION_LIMITS,
+        solver="cbc",
+    ).solver.prob
+
+
+def timeit(func, *args, repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func(*args)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    paths = sorted(glob.glob(csv_path("projections", "*", "*")))
+    if not paths:
+        raise SystemExit(f"No projection files found in {DATA_DIR}")
+
+    print(f"{'week':<28}{'players':>8}{'legacy ms':>12}{'array ms':>12}{'speedup':>10}")
+    totals = [0.0, 0.0]
+    for path in paths:
+        df = pd.read_csv(path)
+        legacy = timeit(build_legacy, df, repeat=args.repeat)
+        array = timeit(build_array, df, repeat=args.repeat)
+        totals[0] += legacy
+        totals[1] += array
+        print(
+            f"{os.path.basename(path):<28}{len(df):>8}"
+            f"{legacy * 1e3:>12.2f}{array * 1e3:>12.2f}{legacy / array:>9.1f}x"
+        )
+    print(
+        f"{'total':<28}{'':>8}{totals[0] * 1e3:>12.2f}{totals[1] * 1e3:>12.2f}"
+        f"{totals[0] / totals[1]:>9.1f}x"
+    )
+
+
+if __name__ == "__main__":
+    main()
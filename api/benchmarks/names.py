@@ -0,0 +1,82 @@
+"""Row-wise apply vs vectorized, memoized player-name normalization.
+
+Runs both cleaners over every player row of a season of salary files (the
+names a projection scrape has to match) and checks they agree. The memoized
+path is timed cold (empty name tables) and warm (tables filled by a prior
+week, the steady state of the scrapers).
+
+    cd api && DATA_DIR=../data python -m benchmarks.names --year 2024
+"""
+import argparse
+import glob
+import time
+
+import pandas as pd
+
+from app.db.storage import csv_path
+from app.helpers import names
+
+
+def normalize_legacy(df: pd.DataFrame) -> pd.Series:
+    return df.apply(
+        lambda x: (
+            x["player"].split()[-1]
+            if x["position"] == "DST"
+            else x["player"]
+            .replace("II", "")
+            .replace(" I", "")
+            .replace("Jr.", "")
+            .replace("Sr.", "")
+            .replace(".", "")
+            .replace("'", "")
+            .strip()
+        ),
+        axis=1,
+    )
+
+
+def timeit(func, repeat: int, setup=None) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        if setup:
+            setup()
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--year", type=int, required=True)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    paths = glob.glob(csv_path("salaries", args.year, "*"))
+    if not paths:
+        raise SystemExit(f"No salary files found for {args.year}")
+    df = pd.concat([pd.read_csv(path) for path in paths], ignore_index=True)
+    df["player"] = df["player"].astype(object)
+
+    def clear():
+        names.PLAYER_NAMES.clear()
+        names.DST_NAMES.clear()
+
+    def normalize():
+        return names.normalize_names(df["player"], df["position"])
+
+    expected = normalize_legacy(df)
+    clear()
+    pd.testing.assert_series_equal(normalize(), expected, check_names=False)
+
+    legacy = timeit(lambda: normalize_legacy(df), args.repeat)
+    cold = timeit(normalize, args.repeat, setup=clear)
+    warm = timeit(normalize, args.repeat)
+    print(f"{len(df)} rows, {df['player'].nunique()} unique names")
+    print(f"{'apply':<12}{legacy * 1e3:>10.1f} ms")
+    print(f"{'cold':<12}{cold * 1e3:>10.1f} ms{legacy / cold:>8.1f}x")
+    print(f"{'warm':<12}{warm * 1e3:>10.1f} ms{legacy / warm:>8.1f}x")
+
+
+if __name__ == "__main__":
+    main()
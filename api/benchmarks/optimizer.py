@@ -0,0 +1,258 @@
+"""Optimizer benchmark over the stored projection weeks, with a JSON report.
+
+Runs ``DFSLineupOptimizer.optimize`` and ``get_optimal_lineups`` on every stored
+week under the option mixes of ``benchmarks.solvers`` (dst, one_te, locks,
+excludes) and times their stages: data load (a cold read through the projection
+store), model build, solve and serializing the response the way the API does.
+Times are medians over ``--repeat`` runs. Peak memory comes from one more run
+under tracemalloc, so it covers Python allocations and not the solver's own.
+
+    cd api && DATA_DIR=../data python -m benchmarks.optimizer --output base.json
+    cd api && DATA_DIR=../data python -m benchmarks.optimizer --output head.json
+    cd api && python -m benchmarks.optimizer --compare base.json head.json
+
+The comparison flags every stage that got slower by more than ``--threshold``
+(and ``--min-ms``, to ignore noise on tiny stages) and every lineup whose
+projected points changed, and exits with status 1 if it found any.
+"""
+import argparse
+import glob
+import json
+import platform
+import resource
+import statistics
+import sys
+import time
+import tracemalloc
+from collections import defaultdict
+from datetime import datetime, timezone
+from typing import Callable, Dict, List
+
+import pandas as pd
+from pydantic import TypeAdapter
+
+from app.configs.configs import DATA_DIR, SOLVER_BACKEND
+from app.db.optimize import DFSLineupOptimizer
+from app.db.storage import csv_path
+from app.db.store import projection_store
+from app.helpers.manifest import parse_year_week
+from app.helpers.metrics import span_seconds
+from app.models.responses.optimize import OptimizeResponse
+from benchmarks.solvers import check_lineup, scenarios
+
+WORKLOADS = ["optimize", "get_optimal_lineups"]
+STAGES = ["load", "build", "solve", "serialize", "total"]
+RESPONSE = TypeAdapter(OptimizeResponse)
+
+
+class StageTimer:
+    def __init__(self):
+        self.seconds: Dict[str, float] = defaultdict(float)
+
+    def wrap(self, stage: str, func: Callable) -> Callable:
+        def timed(*args, **kwargs):
+            start = time.perf_counter()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                self.seconds[stage] += time.perf_counter() - start
+
+        return timed
+
+
+def run(year: int, week: int, solver: str, workload: str, options: dict):
+    optimizer = DFSLineupOptimizer(year=year, week=week, solver=solver)
+    # the stages are timed by wrapping the methods the workload calls on self
+    timer = StageTimer()
+    for stage, method in [
+        ("load", "get_projections_df"),
+        ("build", "build_model"),
+        ("solve", "solve_lineup"),
+    ]:
+        setattr(optimizer, method, timer.wrap(stage, getattr(optimizer, method)))
+    with projection_store.lock:
+        projection_store.frames.pop(optimizer.get_projections_path(), None)
+
+    # get_optimal_lineups converts its lineups to records itself, under the
+    # "serialize" span, optimize leaves that to the route
+    serialized = span_seconds.total("serialize")
+    start = time.perf_counter()
+    result = getattr(optimizer, workload)(use_stored_data=True, **options)
+    serialize_start = time.perf_counter()
+    lineups = (
+        [result.to_dict(orient="records")] if workload == "optimize" else result
+    )
+    RESPONSE.dump_json(lineups)
+    end = time.perf_counter()
+    timer.seconds["serialize"] = (
+        end - serialize_start + span_seconds.total("serialize") - serialized
+    )
+    timer.seconds["total"] = end - start
+    return lineups, timer.seconds
+
+
+def measure(
+    year: int, week: int, solver: str, workload: str, options: dict, repeat: int
+) -> dict:
+    runs = [run(year, week, solver, workload, options) for _ in range(repeat)]
+    lineups = runs[-1][0]
+    for lineup in lineups:
+        check_lineup(pd.DataFrame(lineup), options)
+
+    tracemalloc.start()
+    run(year, week, solver, workload, options)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    row = {
+        f"{stage}_ms": round(
+            statistics.median(seconds[stage] for _, seconds in runs) * 1e3, 3
+        )
+        for stage in STAGES
+    }
+    row["peak_mb"] = round(peak / 2**20, 3)
+    row["points"] = [
+        round(sum(player["proj_fpts"] for player in lineup), 1) for lineup in lineups
+    ]
+    return row
+
+
+def benchmark(args) -> dict:
+    weeks = sorted(
+        parse_year_week(path) for path in glob.glob(csv_path("projections", "*", "*"))
+    )
+    if args.weeks:
+        weeks = [w for w in weeks if f"{w[0]}_w{w[1]}" in args.weeks]
+    if not weeks:
+        raise SystemExit(f"No projection weeks found in {DATA_DIR}")
+    solver = args.solver or SOLVER_BACKEND
+
+    print(f"{'week':<10}{'workload':<22}" + "".join(f"{s + ' ms':>14}" for s in STAGES))
+    results = []
+    for year, week in weeks:
+        df = projection_store.get(
+            DFSLineupOptimizer(year=year, week=week).get_projections_path()
+        )
+        for workload in WORKLOADS:
+            rows = []
+            for scenario, options in scenarios(df).items():
+                row = measure(year, week, solver, workload, options, args.repeat)
+                rows.append(
+                    {
+                        "dataset": f"{year}_w{week}",
+                        "players": len(df),
+                        "workload": workload,
+                        "scenario": scenario,
+                        **row,
+                    }
+                )
+            results.extend(rows)
+            print(
+                f"{year}_w{week:<4}{workload:<22}"
+                + "".join(
+                    f"{sum(row[f'{stage}_ms'] for row in rows):>14.2f}"
+                    for stage in STAGES
+                )
+            )
+
+    return {
+        "created_at": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "solver": solver,
+        "repeat": args.repeat,
+        "max_rss_mb": round(
+            resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 2**10, 1
+        ),
+        "totals": totals(results),
+        "results": results,
+    }
+
+
+def totals(results: List[dict]) -> Dict[str, Dict[str, float]]:
+    # summed stage times per workload, steadier than any single row
+    summed = {
+        workload: {f"{stage}_ms": 0.0 for stage in STAGES} for workload in WORKLOADS
+    }
+    for row in results:
+        for stage in STAGES:
+            summed[row["workload"]][f"{stage}_ms"] += row[f"{stage}_ms"]
+    return {
+        workload: {stage: round(ms, 3) for stage, ms in stages.items()}
+        for workload, stages in summed.items()
+    }
+
+
+def compare(base: dict, head: dict, threshold: float, min_ms: float) -> List[str]:
+    def slower(old: float, new: float) -> bool:
+        return new - old > min_ms and new > old * (1 + threshold)
+
+    def change(old: float, new: float) -> str:
+        percent = (new - old) / old * 100 if old else 0
+        return f"{old:.2f} -> {new:.2f} ms ({percent:+.0f}%)"
+
+    def key(row: dict) -> tuple:
+        return row["dataset"], row["workload"], row["scenario"]
+
+    problems = []
+    print(f"{'workload':<22}{'stage':<14}{'base ms':>12}{'head ms':>12}{'change':>9}")
+    for workload, stages in head["totals"].items():
+        for stage, new in stages.items():
+            old = base["totals"].get(workload, {}).get(stage)
+            if old is None:
+                continue
+            print(
+                f"{workload:<22}{stage:<14}{old:>12.2f}{new:>12.2f}"
+                f"{(new - old) / old * 100 if old else 0:>8.0f}%"
+            )
+            if slower(old, new):
+                problems.append(f"REGRESSION {workload} {stage}: {change(old, new)}")
+
+    base_rows = {key(row): row for row in base["results"]}
+    for row in head["results"]:
+        old = base_rows.get(key(row))
+        if old is None:
+            continue
+        name = " ".join(key(row))
+        if old["points"] != row["points"]:
+            problems.append(
+                f"CHANGED {name} points: {old['points']} -> {row['points']}"
+            )
+        for stage in STAGES:
+            if slower(old[f"{stage}_ms"], row[f"{stage}_ms"]):
+                problems.append(
+                    f"REGRESSION {name} {stage}: "
+                    f"{change(old[f'{stage}_ms'], row[f'{stage}_ms'])}"
+                )
+    return problems
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--solver", default=None)
+    parser.add_argument("--weeks", nargs="+", help="only these weeks, e.g. 2024_w5")
+    parser.add_argument("--output", help="write the JSON report here")
+    parser.add_argument("--compare", nargs=2, metavar=("BASE", "HEAD"))
+    parser.add_argument("--threshold", type=float, default=0.25)
+    parser.add_argument("--min-ms", type=float, default=2.0)
+    args = parser.parse_args()
+
+    if args.compare:
+        reports = []
+        for path in args.compare:
+            with open(path) as f:
+                reports.append(json.load(f))
+        problems = compare(*reports, args.threshold, args.min_ms)
+        print("\n".join(problems) or "No regressions")
+        sys.exit(1 if problems else 0)
+
+    report = benchmark(args)
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+        print(f"Wrote {len(report['results'])} results to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,79 @@
+"""Serial vs process-pool wall clock for a batch of independent solves.
+
+Builds a batch of optimize() tasks for one stored week (every weight set for the
+top DSTs, with and without one_te) and runs it through the serial path and
+through ``ParallelOptimizer``. Results must match task for task. Pool startup
+covers starting every worker and shipping it the player pool, so the parallel
+time is the batch alone. Speedups need more than one core.
+
+    cd api && DATA_DIR=../data python -m benchmarks.parallel --year 2025 --week 5
+"""
+import argparse
+import os
+import time
+
+from app.db.optimize import DFSLineupOptimizer
+from app.db.parallel import ParallelOptimizer
+
+WEIGHTS = [(1, 0), (0.9, 0.1), (0.8, 0.2)]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--year", type=int, required=True)
+    parser.add_argument("--week", type=int, required=True)
+    parser.add_argument("--solver", default=None)
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--dsts", type=int, default=4)
+    args = parser.parse_args()
+
+    optimizer = DFSLineupOptimizer(year=args.year, week=args.week, solver=args.solver)
+    pool = optimizer.get_projections_df(use_stored_data=True)
+    dsts = (
+        pool[pool.position == "DST"]
+        .sort_values("proj_fpts", ascending=False)
+        .player.head(args.dsts)
+    )
+    tasks = [
+        {
+            "dst": dst,
+            "one_te": one_te,
+            "use_avg_fpts": weights[1] > 0,
+            "weights": {"proj_fpts": weights[0], "avg_fpts": weights[1]},
+        }
+        for dst in dsts
+        for one_te in [False, True]
+        for weights in WEIGHTS
+    ]
+
+    start = time.perf_counter()
+    serial = [
+        optimizer.optimize_pool(pool, **task).to_dict(orient="records")
+        for task in tasks
+    ]
+    serial_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    with ParallelOptimizer(
+        year=args.year, week=args.week, solver=args.solver, max_workers=args.workers
+    ) as parallel:
+        parallel.warm_up()
+        startup_time = time.perf_counter() - start
+        start = time.perf_counter()
+        results = parallel.optimize_many(tasks)
+        parallel_time = time.perf_counter() - start
+        workers = parallel.max_workers
+
+    assert results == serial, "parallel results differ from the serial path"
+    print(f"tasks:            {len(tasks)} ({os.cpu_count()} cpus, {workers} workers)")
+    print(f"serial:           {serial_time * 1e3:.1f} ms")
+    print(f"pool startup:     {startup_time * 1e3:.1f} ms")
+    print(f"parallel:         {parallel_time * 1e3:.1f} ms")
+    print(
+        f"speedup:          {serial_time / parallel_time:.2f}x "
+        f"on {os.cpu_count()} cpus"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,122 @@
+"""Solver backend comparison over the stored projection weeks.
+
+For every week and every backend in ``app.db.solvers.SOLVERS`` this runs the
+``get_optimal_lineups`` workload (one model build, one solve per weight set) on
+the stored pool under a few option mixes (dst, one_te, locks, excludes) and
+reports the latency. Every lineup is checked against the DraftKings roster rules
+and all backends must agree on the optimal projected points, so this doubles as
+the cross-check for the exact ``dp`` engine.
+
+    cd api && DATA_DIR=../data python -m benchmarks.solvers
+"""
+import argparse
+import glob
+import os
+import re
+import time
+from typing import Dict, List
+
+import pandas as pd
+
+from app.configs.configs import DATA_DIR
+from app.db.optimize import DFSLineupOptimizer
+from app.db.solvers import SOLVERS
+from app.db.storage import csv_path
+
+WEIGHTS = [(1, 0), (0.9, 0.1), (0.8, 0.2)]
+
+
+def scenarios(df: pd.DataFrame) -> Dict[str, dict]:
+    by_salary = df.sort_values("salary", ascending=False)
+    by_points = df.sort_values("proj_fpts", ascending=False)
+    dst = by_points[by_points.position == "DST"].player.iloc[0]
+    locks = [
+        by_salary[by_salary.position == pos].player.iloc[0] for pos in ["RB", "WR"]
+    ]
+    excludes = [
+        by_points[by_points.position == pos].player.iloc[0] for pos in ["QB", "TE"]
+    ]
+    return {
+        "default": {},
+        "one_te": {"one_te": True},
+        "dst": {"dst": dst},
+        "locks": {"included_players": locks},
+        "excludes": {"excluded_players": excludes},
+        "mixed": {
+            "dst": dst,
+            "one_te": True,
+            "included_players": locks[:1],
+            "excluded_players": excludes[:1],
+        },
+    }
+
+
+def check_lineup(lineup: pd.DataFrame, options: dict) -> None:
+    counts = lineup.position.value_counts()
+    assert len(lineup) == 9, f"{len(lineup)} players"
+    assert lineup.salary.sum() <= 50000, f"salary {lineup.salary.sum()}"
+    assert counts.get("QB", 0) == 1 and counts.get("DST", 0) == 1, dict(counts)
+    assert counts.get("RB", 0) >= 2 and counts.get("WR", 0) >= 3, dict(counts)
+    assert counts.get("TE", 0) >= 1, dict(counts)
+    assert not options.get("one_te") or counts["TE"] == 1, dict(counts)
+    assert set(options.get("included_players", [])) <= set(lineup.player)
+    assert not set(options.get("excluded_players", [])) & set(lineup.player)
+
+
+def run(optimizer: DFSLineupOptimizer, df: pd.DataFrame, options: dict) -> List[float]:
+    model, locked_players = optimizer.build_model(df, **options)
+    points = []
+    for weights in WEIGHTS:
+        weighted_df = df.assign(
+            proj_fpts=optimizer.weighted_fpts(
+                df, {"proj_fpts": weights[0], "avg_fpts": weights[1]}
+            )
+        )
+        lineup = optimizer.solve_lineup(model, weighted_df, locked_players)
+        check_lineup(lineup, options)
+        points.append(round(lineup["proj_fpts"].sum(), 1))
+    return points
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--solvers", nargs="+", default=list(SOLVERS))
+    args = parser.parse_args()
+
+    paths = sorted(glob.glob(csv_path("projections", "*", "*")))
+    if not paths:
+        raise SystemExit(f"No projection files found in {DATA_DIR}")
+
+    print(f"{'week':<28}" + "".join(f"{name + ' ms':>12}" for name in args.solvers))
+    totals = {name: 0.0 for name in args.solvers}
+    mismatches = 0
+    for path in paths:
+        year, week = map(int, re.search(r"(\d+)_w(\d+)", path).groups())
+        df = pd.read_csv(path)
+        row, results = f"{os.path.basename(path):<28}", {}
+        for name in args.solvers:
+            optimizer = DFSLineupOptimizer(year=year, week=week, solver=name)
+            elapsed = 0.0
+            for scenario, options in scenarios(df).items():
+                best = float("inf")
+                for _ in range(args.repeat):
+                    start = time.perf_counter()
+                    results[name, scenario] = run(optimizer, df, options)
+                    best = min(best, time.perf_counter() - start)
+                elapsed += best
+            totals[name] += elapsed
+            row += f"{elapsed * 1e3:>12.2f}"
+        for scenario in scenarios(df):
+            points = {name: results[name, scenario] for name in args.solvers}
+            if len({tuple(p) for p in points.values()}) > 1:
+                mismatches += 1
+                row += f"\n  MISMATCH {scenario}: {points}"
+        print(row)
+    print(f"{'total':<28}" + "".join(f"{totals[n] * 1e3:>12.2f}" for n in args.solvers))
+    if mismatches:
+        raise SystemExit(f"{mismatches} scenario(s) disagree between solvers")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,90 @@
+"""CSV vs partitioned Parquet load time and memory.
+
+Reads every stored week of each dataset one file at a time and as one
+multi-season frame, once from the CSV history and once from the Parquet
+partitions written by ``python -m app.db.storage``. Frames must match.
+
+    cd api && DATA_DIR=../data python -m benchmarks.storage
+"""
+import argparse
+import glob
+import time
+import tracemalloc
+
+import pandas as pd
+
+from app.db.storage import (
+    CSV_PATTERNS,
+    csv_path,
+    partition_path,
+    read_dataset,
+    read_table,
+)
+from app.helpers.manifest import parse_year_week
+
+
+def measure(func, repeat: int):
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func()
+        best = min(best, time.perf_counter() - start)
+    tracemalloc.start()
+    func()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return result, best, peak
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    print(
+        f"{'dataset':<24}{'csv ms':>10}{'parquet ms':>12}{'speedup':>9}"
+        f"{'csv peak MB':>13}{'pq peak MB':>12}{'frame MB':>10}"
+    )
+    for kind in CSV_PATTERNS:
+        weeks = sorted(
+            parse_year_week(path)
+            for path in glob.glob(csv_path(kind, "*", "*"))
+            if glob.glob(partition_path(kind, *parse_year_week(path)))
+        )
+        if not weeks:
+            raise SystemExit(f"No migrated {kind} weeks, run python -m app.db.storage")
+
+        def csv_weeks():
+            return [read_table(kind, csv_path(kind, *week)) for week in weeks]
+
+        def parquet_weeks():
+            return [read_table(kind, partition_path(kind, *week)) for week in weeks]
+
+        def csv_all():
+            return pd.concat(csv_weeks(), ignore_index=True)
+
+        def parquet_all():
+            return read_dataset(kind)
+
+        for label, csv_func, parquet_func in [
+            (f"{kind} per week", csv_weeks, parquet_weeks),
+            (f"{kind} all", csv_all, parquet_all),
+        ]:
+            csv_df, csv_time, csv_peak = measure(csv_func, args.repeat)
+            pq_df, pq_time, pq_peak = measure(parquet_func, args.repeat)
+            if isinstance(csv_df, list):
+                csv_df = pd.concat(csv_df, ignore_index=True)
+                pq_df = pd.concat(pq_df, ignore_index=True)
+            pd.testing.assert_frame_equal(
+                csv_df.astype(object), pq_df.astype(object), check_like=True
+            )
+            print(
+                f"{label:<24}{csv_time * 1e3:>10.1f}{pq_time * 1e3:>12.1f}"
+                f"{csv_time / pq_time:>8.2f}x{csv_peak / 2**20:>13.2f}"
+                f"{pq_peak / 2**20:>12.2f}"
+                f"{pq_df.memory_usage(deep=True).sum() / 2**20:>10.2f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -1,4 +1,5 @@
 import logging
+import os
 from datetime import datetime
 import pytz
 
@@ -27,3 +28,34 @@ handler.setFormatter(formatter)
 log = logging.getLogger("orchestrator")
 log.setLevel(logging.INFO)
 log.addHandler(handler)
+
+# Resident scraper workers (python src/main.py --serve) by scraper image, as
+# host:port. Jobs fall back to a one-shot container when a worker is down.
+SCRAPER_WORKERS = {
+    "dfs-salary-scraper": os.getenv("SALARY_WORKER", "dfs-salary-worker:8700"),
+    "dfs-projection-scraper": os.getenv(
+        "PROJECTION_WORKER", "dfs-projection-worker:8700"
+    ),
+}
+USE_WORKERS = os.getenv("USE_WORKERS", "true").lower() == "true"
+WORKER_CONNECT_TIMEOUT = float(os.getenv("WORKER_CONNECT_TIMEOUT", "5"))
+
+# Scheduled jobs run on a bounded pool, off the scheduler thread
+JOB_WORKERS = int(os.getenv("JOB_WORKERS", "2"))
+# Seconds a job may run before its container (or its process on the worker) is killed
+JOB_TIMEOUTS = {
+    "dfs-salary-scraper": float(os.getenv("SALARY_JOB_TIMEOUT", "1800")),
+    "dfs-projection-scraper": float(os.getenv("PROJECTION_JOB_TIMEOUT", "900")),
+}
+# What to do when a job comes up while its previous run is still going: "skip"
+# it, or "queue" it to run once the previous run finishes
+OVERLAP_POLICIES = {
+    "dfs-salary-scraper": os.getenv("SALARY_OVERLAP", "queue"),
+    "dfs-projection-scraper": os.getenv("PROJECTION_OVERLAP", "skip"),
+}
+# Container logs are forwarded in batches of up to LOG_BATCH_SIZE lines, at
+# least every LOG_FLUSH_INTERVAL seconds
+LOG_BATCH_SIZE = int(os.getenv("LOG_BATCH_SIZE", "100"))
+LOG_FLUSH_INTERVAL = float(os.getenv("LOG_FLUSH_INTERVAL", "2"))
+# One JSON line per run: job, mode, status, exit code, duration
+RUN_HISTORY_PATH = os.getenv("RUN_HISTORY_PATH", "/app/data/orchestrator/runs.jsonl")
@@ -3,8 +3,22 @@ from zoneinfo import ZoneInfo
 
 import backoff
 import docker
+import requests
 import schedule
-from configs import log
+from configs import (
+    JOB_TIMEOUTS,
+    JOB_WORKERS,
+    LOG_BATCH_SIZE,
+    LOG_FLUSH_INTERVAL,
+    OVERLAP_POLICIES,
+    RUN_HISTORY_PATH,
+    SCRAPER_WORKERS,
+    USE_WORKERS,
+    WORKER_CONNECT_TIMEOUT,
+    log,
+)
+from runs import JobPool, LogForwarder, RunHistory
+from worker import WorkerUnavailable, send_job
 
 
 class ScraperOrchestrator:
@@ -12,6 +26,10 @@ class ScraperOrchestrator:
         # Docker client
         self.docker_client = docker.DockerClient(base_url="unix://var/run/docker.sock")
         self.network_name = "dfs_optimizer_network"
+        # Jobs run off the scheduler thread, with their container logs batched
+        self.history = RunHistory(RUN_HISTORY_PATH)
+        self.pool = JobPool(JOB_WORKERS, self.history)
+        self.log_forwarder = LogForwarder(LOG_BATCH_SIZE, LOG_FLUSH_INTERVAL)
         # Set up schedules
         self.setup_schedules()
 
@@ -19,27 +37,90 @@ class ScraperOrchestrator:
         log.info("Setting up scraper schedules...")
         # Salary scraper → Once per week, Tuesday 9:00 AM ET
         schedule.every().tuesday.at("09:00", "America/New_York").do(
-            self.run_salary_scraper
+            self.submit, "dfs-salary-scraper", self.run_salary_scraper
         )
         # Projection scraper → Every hour, Tue 10:00 AM through Thu 8:00 PM ET
         for day in ["tuesday", "wednesday", "thursday"]:
             for hour in range(10, 21):  # 10:00 AM to 8:00 PM inclusive
                 schedule.every().__getattribute__(day).at(
                     f"{hour:02d}:00", "America/New_York"
-                ).do(self.run_projection_scraper)
+                ).do(self.submit, "dfs-projection-scraper", self.run_projection_scraper)
         log.info("✅ Schedules set up successfully")
 
+    def submit(self, container_name: str, func):
+        # the scheduler thread only hands jobs to the pool
+        self.pool.submit(
+            container_name, func, OVERLAP_POLICIES.get(container_name, "skip")
+        )
+
     @backoff.on_exception(backoff.expo, docker.errors.APIError, max_tries=3)
     def run_salary_scraper(self):
         log.info("Starting scheduled salary scraper...")
-        self.run_container("dfs-salary-scraper")
+        self.run_scraper("dfs-salary-scraper")
 
     @backoff.on_exception(backoff.expo, docker.errors.APIError, max_tries=3)
     def run_projection_scraper(self):
         log.info("Starting scheduled projection scraper...")
-        self.run_container("dfs-projection-scraper")
+        self.run_scraper("dfs-projection-scraper")
+
+    def run_scraper(self, container_name: str) -> dict:
+        """Run a scrape job on the resident worker, or in a fresh container."""
+        started = time.time()
+        start = time.perf_counter()
+        timeout = JOB_TIMEOUTS.get(container_name)
+        result = None
+        if USE_WORKERS and container_name in SCRAPER_WORKERS:
+            try:
+                result = ("worker", *self.run_worker(container_name, timeout))
+            except WorkerUnavailable as e:
+                log.warning(
+                    f"{container_name} worker unavailable ({e}), using a container"
+                )
+        if result is None:
+            result = ("container", *self.run_container(container_name, timeout))
+
+        mode, status, exit_code, error = result
+        seconds = time.perf_counter() - start
+        log.info(f"{container_name} job {status} after {seconds:.1f}s ({mode})")
+        return self.history.add(
+            container_name, status, mode, exit_code, started, seconds, error
+        )
 
-    def run_container(self, container_name: str):
+    def run_worker(self, container_name: str, timeout: float):
+        address = SCRAPER_WORKERS[container_name]
+        try:
+            result = send_job(
+                address,
+                "scrape",
+                timeout=timeout,
+                connect_timeout=WORKER_CONNECT_TIMEOUT,
+            )
+        except WorkerUnavailable:
+            raise
+        except TimeoutError:
+            # the worker kills the job itself at the timeout, so no answer even
+            # after the grace period means the worker is stuck
+            log.error(f"{container_name} on {address} did not answer after {timeout}s")
+            return "timeout", None, f"No result after {timeout}s"
+        except Exception as e:
+            # the job was handed over, running it again in a container could
+            # overlap with the worker
+            log.error(f"Error running {container_name} on {address}: {str(e)}")
+            return "failed", None, str(e)
+
+        if result["ok"]:
+            log.info(
+                f"{container_name} completed successfully on {address} "
+                f"(ran {result['seconds']}s)."
+            )
+            return "ok", 0, None
+        if result.get("timed_out"):
+            log.error(f"{container_name} on {address} timed out: {result['error']}")
+            return "timeout", None, result["error"]
+        log.error(f"{container_name} failed on {address}: {result['error']}")
+        return "failed", 1, result["error"]
+
+    def run_container(self, container_name: str, timeout: float):
         container_config = {
             "image": container_name,
             "detach": True,
@@ -55,21 +136,31 @@ class ScraperOrchestrator:
         try:
             container = self.docker_client.containers.run(**container_config)
 
-            # Stream logs while running
-            for line in container.logs(stream=True):
-                log.info(f"[{container_name}] {line.decode().strip()}")
+            # Logs are read and forwarded in batches on their own threads
+            reader = self.log_forwarder.follow(container, container_name)
+
+            # Capture exit status, a hung container is killed
+            try:
+                exit_code = container.wait(timeout=timeout)["StatusCode"]
+            except requests.exceptions.RequestException:
+                log.error(f"{container_name} timed out after {timeout}s, killing it")
+                container.kill()
+                return "timeout", None, f"Killed after {timeout}s"
+            finally:
+                reader.join(timeout=LOG_FLUSH_INTERVAL)
 
-            # Capture exit status
-            exit_code = container.wait()["StatusCode"]
             if exit_code == 0:
                 log.info(f"{container_name} completed successfully.")
-            else:
-                log.error(f"{container_name} exited with status code {exit_code}")
+                return "ok", exit_code, None
+            log.error(f"{container_name} exited with status code {exit_code}")
+            return "failed", exit_code, None
 
         except docker.errors.APIError as e:
             log.error(f"Docker API error running {container_name}: {str(e)}")
+            return "failed", None, str(e)
         except Exception as e:
             log.error(f"Error running {container_name}: {str(e)}")
+            return "failed", None, str(e)
 
     def run(self):
         log.info("Starting scheduler loop...")
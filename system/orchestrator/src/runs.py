@@ -0,0 +1,143 @@
+import json
+import os
+import queue
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+from typing import Callable, Dict, List, Optional
+
+from configs import log
+
+
+class RunHistory:
+    """Recent runs in memory, every run appended to a JSON lines file."""
+
+    def __init__(self, path: str, keep: int = 200):
+        self.path = path
+        self.runs = deque(maxlen=keep)
+        self.lock = threading.Lock()
+
+    def add(
+        self,
+        job: str,
+        status: str,
+        mode: Optional[str] = None,
+        exit_code: Optional[int] = None,
+        started: Optional[float] = None,
+        seconds: Optional[float] = None,
+        error: Optional[str] = None,
+    ) -> dict:
+        run = {
+            "job": job,
+            "mode": mode,
+            "status": status,
+            "exit_code": exit_code,
+            "started_at": datetime.fromtimestamp(
+                time.time() if started is None else started, timezone.utc
+            ).isoformat(timespec="seconds"),
+            "seconds": None if seconds is None else round(seconds, 3),
+            "error": error,
+        }
+        with self.lock:
+            self.runs.append(run)
+            try:
+                os.makedirs(os.path.dirname(self.path), exist_ok=True)
+                with open(self.path, "a") as f:
+                    f.write(json.dumps(run) + "\n")
+            except OSError as e:
+                log.error(f"Could not write run history to {self.path}: {str(e)}")
+        return run
+
+    def recent(self, job: Optional[str] = None) -> List[dict]:
+        with self.lock:
+            return [run for run in self.runs if job is None or run["job"] == job]
+
+
+class LogForwarder:
+    """Forwards container log lines to the orchestrator log in batches.
+
+    Each container gets a reader thread, a single forwarding thread logs what
+    they read once ``batch_size`` lines are waiting or every ``interval``
+    seconds, so chatty containers never hold up the jobs that run them.
+    """
+
+    def __init__(self, batch_size: int, interval: float):
+        self.batch_size = batch_size
+        self.interval = interval
+        self.lines = queue.Queue()
+        threading.Thread(target=self.forward, daemon=True).start()
+
+    def follow(self, container, name: str) -> threading.Thread:
+        def read():
+            try:
+                for line in container.logs(stream=True, follow=True):
+                    self.lines.put((name, line.decode(errors="replace").rstrip()))
+            except Exception as e:
+                log.warning(f"Stopped following {name} logs: {str(e)}")
+
+        thread = threading.Thread(target=read, daemon=True)
+        thread.start()
+        return thread
+
+    def forward(self):
+        while True:
+            batch = [self.lines.get()]
+            deadline = time.monotonic() + self.interval
+            while len(batch) < self.batch_size:
+                try:
+                    batch.append(
+                        self.lines.get(timeout=max(deadline - time.monotonic(), 0))
+                    )
+                except queue.Empty:
+                    break
+            by_name: Dict[str, List[str]] = {}
+            for name, line in batch:
+                by_name.setdefault(name, []).append(line)
+            for name, lines in by_name.items():
+                log.info("\n".join(f"[{name}] {line}" for line in lines))
+
+
+class JobPool:
+    """Runs scheduled jobs on a bounded thread pool.
+
+    A job that comes up while its previous run is still going is skipped, or
+    queued to run once right after it, per its overlap policy.
+    """
+
+    def __init__(self, workers: int, history: RunHistory):
+        self.executor = ThreadPoolExecutor(
+            max_workers=workers, thread_name_prefix="job"
+        )
+        self.history = history
+        self.lock = threading.Lock()
+        self.running = set()
+        self.pending = set()
+
+    def submit(self, name: str, func: Callable[[], None], policy: str = "skip"):
+        with self.lock:
+            if name in self.running:
+                if policy == "queue" and name not in self.pending:
+                    self.pending.add(name)
+                    log.info(f"{name} is still running, queued the next run")
+                    return
+                log.warning(f"{name} is still running, skipped this run")
+                self.history.add(name, "skipped")
+                return
+            self.running.add(name)
+        self.executor.submit(self.run, name, func)
+
+    def run(self, name: str, func: Callable[[], None]):
+        try:
+            func()
+        except Exception as e:
+            log.error(f"Error running {name}: {str(e)}")
+        finally:
+            with self.lock:
+                queued = name in self.pending
+                self.pending.discard(name)
+                if not queued:
+                    self.running.discard(name)
+            if queued:
+                self.executor.submit(self.run, name, func)
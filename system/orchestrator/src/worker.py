@@ -0,0 +1,37 @@
+import json
+import socket
+from typing import Optional
+
+
+class WorkerUnavailable(Exception):
+    """No worker is listening at the address, the job was not sent."""
+
+
+def send_job(
+    address: str,
+    job: str,
+    params: Optional[dict] = None,
+    timeout: Optional[float] = None,
+    connect_timeout: float = 5.0,
+    grace: float = 30.0,
+) -> dict:
+    """Run ``job`` on the scraper worker at ``host:port`` and wait for its result.
+
+    The worker kills the job after ``timeout`` seconds and answers with
+    ``timed_out`` set, the connection itself is only given up on ``grace``
+    seconds later.
+    """
+    host, port = address.rsplit(":", 1)
+    try:
+        conn = socket.create_connection((host, int(port)), timeout=connect_timeout)
+    except OSError as e:
+        raise WorkerUnavailable(f"{address}: {e}") from e
+    with conn:
+        conn.settimeout(None if timeout is None else timeout + grace)
+        request = {"job": job, "params": params or {}, "timeout": timeout}
+        conn.sendall((json.dumps(request) + "\n").encode())
+        with conn.makefile("rb") as f:
+            line = f.readline()
+    if not line:
+        raise ConnectionError(f"{address} closed the connection without a result")
+    return json.loads(line)
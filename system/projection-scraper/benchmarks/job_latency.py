@@ -0,0 +1,138 @@
+"""Scrape job latency, one-shot process per job vs a resident worker.
+
+Runs full projection scrape jobs against the local FantasyPros stand-in from
+``scrape.py``, into a temporary DATA_DIR: first as a fresh ``python src/main.py``
+per job (interpreter start, imports, new sessions, the scrape), then as jobs
+sent to one ``python src/main.py --serve`` worker. Container start time comes on
+top of the one-shot numbers in production and is not measured here.
+
+    cd system/projection-scraper && PYTHONPATH=src python benchmarks/job_latency.py \\
+        --projections ../../data/projections/fp_projection_2024_w5.csv \\
+        --salaries ../../data/salaries/dk_salary_2024_w5.csv
+"""
+import argparse
+import os
+import shutil
+import socket
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime
+
+import pandas as pd
+from configs import STATS_COLUMN_MAPPINGS
+from scrape import rankings_page, serve, stats_page
+from season import current_week
+from worker import WorkerUnavailable, send_job
+
+SRC_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "src"))
+POSITIONS = ["QB", "RB", "WR", "TE", "DST"]
+
+
+def free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def wait_for_worker(address: str, timeout: float = 60) -> None:
+    deadline = time.monotonic() + timeout
+    while True:
+        try:
+            send_job(address, "ping", connect_timeout=1)
+            return
+        except WorkerUnavailable:
+            if time.monotonic() > deadline:
+                raise
+            time.sleep(0.05)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--projections", required=True)
+    parser.add_argument("--salaries", required=True)
+    parser.add_argument("--latency", type=float, default=0.05)
+    parser.add_argument("--jobs", type=int, default=5)
+    args = parser.parse_args()
+
+    df = pd.read_csv(args.projections)
+    pages = {}
+    for pos in POSITIONS:
+        players = df[df.position == pos]
+        rankings = "ppr-" if pos not in ["QB", "DST"] else ""
+        pages[f"/nfl/rankings/{rankings}{pos.lower()}.php"] = rankings_page(players)
+        pages[f"/nfl/stats/{pos.lower()}.php"] = stats_page(
+            players, len(STATS_COLUMN_MAPPINGS[pos])
+        )
+    server = serve(pages, args.latency)
+
+    data_dir = tempfile.mkdtemp(prefix="dfs_data_")
+    os.makedirs(f"{data_dir}/projections")
+    os.makedirs(f"{data_dir}/salaries")
+    # the scraper takes the week from the season calendar
+    year, week = datetime.now().year, current_week()
+    shutil.copy(
+        args.salaries, f"{data_dir}/salaries/dk_salary_{year}_w{week}.csv"
+    )
+    port = free_port()
+    env = {
+        **os.environ,
+        "PYTHONPATH": SRC_DIR,
+        "DATA_DIR": data_dir,
+        "FANTASYPROS_URL": f"http://127.0.0.1:{server.server_port}",
+        "HTTP_CACHE_MODE": "off",
+        "WORKER_HOST": "127.0.0.1",
+    }
+    main_py = os.path.join(SRC_DIR, "main.py")
+
+    one_shot = []
+    for _ in range(args.jobs):
+        start = time.perf_counter()
+        subprocess.run(
+            [sys.executable, main_py], env=env, check=True, stderr=subprocess.DEVNULL
+        )
+        one_shot.append(time.perf_counter() - start)
+
+    start = time.perf_counter()
+    worker = subprocess.Popen(
+        [sys.executable, main_py, "--serve", "--port", str(port)],
+        env=env,
+        stderr=subprocess.DEVNULL,
+    )
+    address = f"127.0.0.1:{port}"
+    try:
+        wait_for_worker(address)
+        startup = time.perf_counter() - start
+        resident = []
+        for _ in range(args.jobs):
+            start = time.perf_counter()
+            result = send_job(address, "scrape")
+            resident.append(time.perf_counter() - start)
+            assert result["ok"], result
+    finally:
+        worker.terminate()
+        worker.wait()
+        server.shutdown()
+
+    output = f"{data_dir}/projections/fp_projection_{year}_w{week}.csv"
+    rows = len(pd.read_csv(output))
+    shutil.rmtree(data_dir)
+    print(f"{'mode':<22}{'median ms':>11}{'min ms':>9}{'max ms':>9}")
+    for label, times in [
+        ("one-shot process", one_shot),
+        ("resident worker", resident),
+    ]:
+        print(
+            f"{label:<22}{statistics.median(times) * 1e3:>11.1f}"
+            f"{min(times) * 1e3:>9.1f}{max(times) * 1e3:>9.1f}"
+        )
+    print(
+        f"worker startup {startup * 1e3:.1f} ms (once), {args.jobs} jobs each, "
+        f"{rows} players, {args.latency}s page latency"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,156 @@
+"""Page parser micro-benchmark against the implementations they replaced.
+
+Rankings pages: ecrData extraction vs BeautifulSoup + regex. Stats pages: the
+``#data`` table parser vs ``pd.read_html`` plus the rename and % casts.
+
+Uses recorded FantasyPros pages from an HTTP cache directory (``--cache-dir``,
+e.g. one filled by a scrape with HTTP_CACHE_MODE=online) or, without one,
+stand-in pages built from a stored projection week and padded with filler
+markup to roughly the size of the live pages. Outputs must match.
+
+    cd system/projection-scraper && PYTHONPATH=src python benchmarks/pages.py \\
+        --projections ../../data/projections/fp_projection_2024_w5.csv
+"""
+import argparse
+import glob
+import json
+import os
+import re
+import time
+from io import StringIO
+
+import bs4 as bs
+import pandas as pd
+from configs import STATS_COLUMN_MAPPINGS
+from parsers import parse_data_table, parse_rankings
+from scrape import rankings_page, stats_page
+
+POSITIONS = ["QB", "RB", "WR", "TE", "DST"]
+
+
+def parse_rankings_legacy(html: str, year: int, week: int) -> pd.DataFrame:
+    rankings_list = []
+    cxt = bs.BeautifulSoup(html, features="lxml")
+    script_tags = cxt.find_all("script", attrs={"type": "text/javascript"})
+    for script_tag in script_tags:
+        script_text = script_tag.text.strip()
+        if "var ecrData =" in script_text:
+            ecrData_match = re.search(r"var ecrData = (.*?});", script_text)
+            if ecrData_match:
+                players = json.loads(ecrData_match.group(1))["players"]
+                for player in players:
+                    try:
+                        rankings_list.append(
+                            {
+                                "player": str(player["player_name"]),
+                                "position": str(player["player_position_id"]),
+                                "year": int(year),
+                                "week": int(week),
+                                "rank": int(player["rank_ecr"]),
+                                "min_rank": int(player["rank_min"]),
+                                "max_rank": int(player["rank_max"]),
+                                "avg_rank": float(player["rank_ave"]),
+                                "std_rank": float(player["rank_std"]),
+                                "grade": str(player["start_sit_grade"]),
+                                "proj_fpts": float(player.get("r2p_pts", 0.0)),
+                            }
+                        )
+                    except:
+                        pass
+    return pd.DataFrame(rankings_list)
+
+
+def parse_stats_legacy(html: str, position: str) -> pd.DataFrame:
+    df = pd.io.html.read_html(StringIO(html), attrs={"id": "data"})[0].iloc[:, 1:]
+    df.columns = STATS_COLUMN_MAPPINGS[position]
+    df["rost"] = df.rost.str.strip("%").astype(float)
+    return df
+
+
+def parse_stats(html: str, position: str) -> pd.DataFrame:
+    return parse_data_table(html, STATS_COLUMN_MAPPINGS[position], skip=1)
+
+
+def pad(html: str, kilobytes: int) -> str:
+    # live pages carry navigation, ads and a few dozen unrelated scripts
+    filler = "".join(
+        f'<div class="nav-item"><a href="/nfl/{i}">Link {i}</a></div>'
+        f'<script type="text/javascript">var config{i} = {{"id": {i}}};</script>'
+        for i in range(kilobytes * 1024 // 120)
+    )
+    return html.replace("<head>", f"<head>{filler[: len(filler) // 2]}").replace(
+        "<body>", f"<body>{filler[len(filler) // 2 :]}"
+    )
+
+
+def recorded_pages(cache_dir: str, path: str) -> dict:
+    """Recorded pages whose url contains ``path``, by position."""
+    pages = {}
+    for entry_path in glob.glob(os.path.join(cache_dir, "entries", "*.json")):
+        with open(entry_path) as f:
+            entry = json.load(f)
+        if path in entry["url"]:
+            position = entry["url"].rsplit("/", 1)[-1].split(".")[0]
+            position = position.replace("ppr-", "").upper()
+            with open(os.path.join(cache_dir, "objects", entry["sha256"]), "rb") as f:
+                pages[position] = f.read().decode(entry["encoding"])
+    return pages
+
+
+def timeit(func, *args, repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func(*args)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    source = parser.add_mutually_exclusive_group(required=True)
+    source.add_argument("--cache-dir")
+    source.add_argument("--projections")
+    parser.add_argument("--padding", type=int, default=300, help="filler KB")
+    parser.add_argument("--repeat", type=int, default=10)
+    args = parser.parse_args()
+
+    if args.cache_dir:
+        rankings = recorded_pages(args.cache_dir, "/nfl/rankings/")
+        stats = recorded_pages(args.cache_dir, "/nfl/stats/")
+    else:
+        df = pd.read_csv(args.projections)
+        players = {pos: df[df.position == pos] for pos in POSITIONS}
+        rankings = {
+            pos: pad(rankings_page(players[pos]), args.padding) for pos in POSITIONS
+        }
+        stats = {
+            pos: pad(
+                stats_page(players[pos], len(STATS_COLUMN_MAPPINGS[pos])),
+                args.padding,
+            )
+            for pos in POSITIONS
+        }
+    if not rankings or not stats:
+        raise SystemExit("No rankings or stats pages found")
+
+    print(f"{'page':<16}{'KB':>6}{'legacy ms':>11}{'fast ms':>9}{'speedup':>9}")
+    for kind, pages, legacy_func, fast_func, arg in [
+        ("rankings", rankings, parse_rankings_legacy, parse_rankings, None),
+        ("stats", stats, parse_stats_legacy, parse_stats, None),
+    ]:
+        for pos, html in pages.items():
+            args_ = (html, 2024, 5) if kind == "rankings" else (html, pos)
+            pd.testing.assert_frame_equal(
+                fast_func(*args_), legacy_func(*args_), check_dtype=False
+            )
+            legacy = timeit(legacy_func, *args_, repeat=args.repeat)
+            fast = timeit(fast_func, *args_, repeat=args.repeat)
+            print(
+                f"{f'{kind} {pos}':<16}{len(html) // 1024:>6}{legacy * 1e3:>11.2f}"
+                f"{fast * 1e3:>9.2f}{legacy / fast:>8.1f}x"
+            )
+
+
+if __name__ == "__main__":
+    main()
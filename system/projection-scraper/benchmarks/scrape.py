@@ -0,0 +1,159 @@
+"""End-to-end fetch stage timing against a local stand-in for FantasyPros.
+
+Serves rankings and stats pages built from a stored projection week with a
+fixed per-request latency (and ETags), then runs ``fetch_projections`` the way
+the scraper used to (serial, a new connection per request), concurrently on the
+pooled keep-alive session, and through the response cache: cold, warm,
+revalidated with 304s and in offline replay. Results must match.
+
+    cd system/projection-scraper && PYTHONPATH=src python benchmarks/scrape.py \\
+        --projections ../../data/projections/fp_projection_2024_w5.csv
+"""
+import argparse
+import hashlib
+import json
+import os
+import shutil
+import tempfile
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlparse
+
+import pandas as pd
+
+
+def rankings_page(players: pd.DataFrame) -> str:
+    ecr_data = {
+        "players": [
+            {
+                "player_name": row.player,
+                "player_position_id": row.position,
+                "rank_ecr": int(row.rank),
+                "rank_min": int(row.rank),
+                "rank_max": int(row.rank) + 3,
+                "rank_ave": float(row.rank) + 0.5,
+                "rank_std": 1.2,
+                "start_sit_grade": row.grade,
+                "r2p_pts": float(row.proj_fpts),
+            }
+            for row in players.itertuples()
+        ]
+    }
+    return (
+        '<html><head><script type="text/javascript">'
+        f"var ecrData = {json.dumps(ecr_data)};</script></head><body></body></html>"
+    )
+
+
+def stats_page(players: pd.DataFrame, columns: int) -> str:
+    header = "".join(f"<th>c{i}</th>" for i in range(columns + 1))
+    rows = "".join(
+        f"<tr><td>{i}</td><td>{row.player} ({row.team})</td>"
+        + "".join(f"<td>{row.avg_fpts * 4:.1f}</td>" for _ in range(columns - 5))
+        + f"<td>4</td><td>{row.avg_fpts * 4:.1f}</td><td>{row.avg_fpts:.1f}</td>"
+        "<td>50.0%</td></tr>"
+        for i, row in enumerate(players.itertuples(), start=1)
+    )
+    return (
+        f'<html><body><table id="data"><thead><tr>{header}</tr></thead>'
+        f"<tbody>{rows}</tbody></table></body></html>"
+    )
+
+
+def serve(pages: dict, latency: float) -> ThreadingHTTPServer:
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def do_GET(self):
+            time.sleep(latency)
+            server.requests += 1
+            body = pages[urlparse(self.path).path].encode()
+            etag = f'"{hashlib.sha256(body).hexdigest()[:16]}"'
+            if self.headers.get("If-None-Match") == etag:
+                self.send_response(304)
+                self.send_header("ETag", etag)
+                self.send_header("Content-Length", "0")
+                self.end_headers()
+                return
+            self.send_response(200)
+            self.send_header("Content-Type", "text/html; charset=utf-8")
+            self.send_header("ETag", etag)
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    server.requests = 0
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--projections", required=True)
+    parser.add_argument("--latency", type=float, default=0.25)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    df = pd.read_csv(args.projections)
+    pages = {}
+    server = serve(pages, args.latency)
+    os.environ["FANTASYPROS_URL"] = f"http://127.0.0.1:{server.server_port}"
+    os.environ["HTTP_CACHE_DIR"] = tempfile.mkdtemp(prefix="http_cache_")
+
+    import requests
+
+    import main
+    import utils
+    from configs import FETCH_WORKERS, STATS_COLUMN_MAPPINGS
+
+    for pos in main.POSITIONS:
+        players = df[df.position == pos]
+        rankings = "ppr-" if pos not in ["QB", "DST"] else ""
+        pages[f"/nfl/rankings/{rankings}{pos.lower()}.php"] = rankings_page(players)
+        pages[f"/nfl/stats/{pos.lower()}.php"] = stats_page(
+            players, len(STATS_COLUMN_MAPPINGS[pos])
+        )
+
+    session = utils.session
+    cache = utils.http_cache
+    policies = cache.policies
+    results = {}
+    for label, client, workers, mode, expired in [
+        ("serial, new connections", requests, 1, "off", False),
+        ("concurrent, pooled", session, FETCH_WORKERS, "off", False),
+        ("cache cold", session, FETCH_WORKERS, "online", False),
+        ("cache warm", session, FETCH_WORKERS, "online", False),
+        ("cache revalidated (304)", session, FETCH_WORKERS, "online", True),
+        ("cache replay", session, FETCH_WORKERS, "replay", False),
+    ]:
+        # the requests module has the same get() as a session, minus pooling
+        utils.session = client
+        cache.mode = mode
+        # a zero TTL makes every cached page stale, so each one is revalidated
+        cache.policies = [(p, 0) for p, _ in policies] if expired else policies
+        repeat = 1 if label == "cache cold" else args.repeat
+        served = server.requests
+        best = float("inf")
+        for _ in range(repeat):
+            start = time.perf_counter()
+            results[label] = main.fetch_projections(2024, 5, workers=workers)
+            best = min(best, time.perf_counter() - start)
+        requests_made = (server.requests - served) // repeat
+        print(f"{label:<26}{best * 1e3:>10.1f} ms{requests_made:>6} requests")
+    utils.session = session
+    server.shutdown()
+    shutil.rmtree(cache.directory)
+
+    expected = results.pop("serial, new connections")
+    for result in results.values():
+        pd.testing.assert_frame_equal(expected, result)
+    print(f"{len(expected)} players, {len(pages)} pages, {args.latency}s latency")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,4 +1,5 @@
 import logging
+import os
 from datetime import datetime
 
 import pytz
@@ -32,6 +33,46 @@ log = logging.getLogger("projection-scraper")
 log.setLevel(logging.INFO)
 log.addHandler(handler)
 
+DATA_DIR = os.getenv("DATA_DIR", "/app/data")
+# (year, week) index of every dataset in DATA_DIR, maintained by the scrapers
+MANIFEST_PATH = f"{DATA_DIR}/manifest.json"
+# Typed copies of every week, partitioned as {kind}/year=YYYY/week=W/data.parquet
+PARQUET_DIR = f"{DATA_DIR}/parquet"
+# Column types of the projections partitions, shared with the API
+DTYPES = {
+    "year": "int32",
+    "week": "int32",
+    "player": "string",
+    "position": "category",
+    "team": "category",
+    "opponent": "category",
+    "grade": "category",
+    "rank": "int32",
+    "avg_fpts": "float64",
+    "proj_fpts": "float64",
+    "salary": "int32",
+}
+
+FANTASYPROS_URL = os.getenv("FANTASYPROS_URL", "https://www.fantasypros.com")
+# Page fetches run concurrently on a shared keep-alive session, at most
+# FETCH_MAX_CONNECTIONS open to FantasyPros at a time
+FETCH_WORKERS = int(os.getenv("FETCH_WORKERS", "10"))
+FETCH_MAX_CONNECTIONS = int(os.getenv("FETCH_MAX_CONNECTIONS", "4"))
+# Retries for connection errors and 429/5xx responses, exponential backoff
+FETCH_RETRIES = int(os.getenv("FETCH_RETRIES", "3"))
+FETCH_BACKOFF = float(os.getenv("FETCH_BACKOFF", "0.5"))
+FETCH_TIMEOUT = float(os.getenv("FETCH_TIMEOUT", "30"))
+# On-disk cache of FantasyPros responses, mode is online, replay or off
+HTTP_CACHE_DIR = os.getenv("HTTP_CACHE_DIR", f"{DATA_DIR}/http_cache")
+HTTP_CACHE_MAX_BYTES = int(os.getenv("HTTP_CACHE_MAX_BYTES", str(256 * 2**20)))
+HTTP_CACHE_MODE = os.getenv("HTTP_CACHE_MODE", "online")
+# The week comes from the local season calendar, WEEK_CHECK also compares it to
+# the FantasyPros leaders report and logs a warning when they disagree
+WEEK_CHECK = os.getenv("WEEK_CHECK", "false").lower() == "true"
+# Resident worker mode (python src/main.py --serve) listens here for jobs
+WORKER_HOST = os.getenv("WORKER_HOST", "0.0.0.0")
+WORKER_PORT = int(os.getenv("WORKER_PORT", "8700"))
+
 PROJECTIONS_COLUMN_MAPPINGS = {
     "QB": [
         "player",
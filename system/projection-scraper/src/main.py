@@ -1,69 +1,102 @@
+import argparse
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 from typing import Optional
 
 import pandas as pd
-from configs import log
-from utils import get_current_week, get_stats, get_weekly_rankings
+from changes import publish_changes, write_if_changed
+from configs import (
+    DATA_DIR,
+    FETCH_WORKERS,
+    WEEK_CHECK,
+    WORKER_HOST,
+    WORKER_PORT,
+    log,
+)
+from names import normalize_names
+from season import season_week
+from utils import (
+    get_current_week,
+    get_stats,
+    get_weekly_rankings,
+    update_manifest,
+    write_partition,
+)
+from worker import serve
+
+POSITIONS = ["QB", "RB", "WR", "TE", "DST"]
+
+
+def fetch_projections(
+    year: int, week: int, workers: int = FETCH_WORKERS
+) -> pd.DataFrame:
+    """Rankings merged with recent average points for every position.
+
+    The ten pages are fetched concurrently and each one is parsed by its worker
+    as soon as it arrives.
+    """
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        rankings = {
+            pos: pool.submit(get_weekly_rankings, pos, year, week)
+            for pos in POSITIONS
+        }
+        stats = {
+            pos: pool.submit(get_stats, pos, year, [week - 4, week - 1])
+            for pos in POSITIONS
+        }
+        return pd.concat(
+            [
+                pd.merge(
+                    rankings[pos].result(),
+                    stats[pos].result()[["player", "avg_fpts"]],
+                    how="left",
+                )
+                for pos in POSITIONS
+            ]
+        )
 
 
 class ProjectionScraper:
     def __init__(self):
         self.current_date = datetime.now()
         self.current_year = self.current_date.year
-        self.current_week = get_current_week(year=self.current_year)
-        # adjusted year for FantasyPro's site
-        self.fp_year = (
-            self.current_year - 1
-            if self.current_date.month in [1, 2]
-            else self.current_year
-        )
+        # FantasyPros files January and February games under the previous year
+        self.fp_year, self.current_week = season_week(self.current_date.date())
+        if WEEK_CHECK:
+            self.check_week()
+
+    def check_week(self) -> None:
+        # the leaders report is cached by http_cache, see TTL_POLICIES
+        try:
+            week = get_current_week(year=self.fp_year)
+        except Exception as e:
+            log.warning("Could not check the week against FantasyPros: %s", e)
+            return
+        if week != self.current_week:
+            log.warning(
+                "Season calendar says week %s, FantasyPros says week %s",
+                self.current_week,
+                week,
+            )
 
     def get_salary_df(
         self, year: Optional[int] = None, week: Optional[int] = None
     ) -> pd.DataFrame:
         year = self.current_year if year is None else year
         week = self.current_week if week is None else week
-        path_to_csv = f"/app/data/salaries/dk_salary_{year}_w{week}.csv"
+        path_to_csv = f"{DATA_DIR}/salaries/dk_salary_{year}_w{week}.csv"
         return pd.read_csv(path_to_csv)
 
     def scrape(self, year: Optional[int] = None, week: Optional[int] = None) -> None:
         year = self.current_year if year is None else year
         week = self.current_week if week is None else week
-        df = pd.DataFrame()
 
         log.info(
             "Scraping projections from FantasyPro's for year=%s, week=%s", year, week
         )
 
-        for pos in ["QB", "RB", "WR", "TE", "DST"]:
-            df = pd.concat(
-                [
-                    df,
-                    pd.merge(
-                        get_weekly_rankings(pos, self.fp_year, week),
-                        get_stats(pos, self.fp_year, [week - 4, week - 1])[
-                            ["player", "avg_fpts"]
-                        ],
-                        how="left",
-                    ),
-                ]
-            )
-
-        df["player"] = df.apply(
-            lambda x: (
-                x["player"].split()[-1]
-                if x["position"] == "DST"
-                else x["player"]
-                .replace("II", "")
-                .replace(" I", "")
-                .replace("Jr.", "")
-                .replace("Sr.", "")
-                .replace(".", "")
-                .replace("'", "")
-                .strip()
-            ),
-            axis=1,
-        )
+        df = fetch_projections(self.fp_year, week)
+        df["player"] = normalize_names(df["player"], df["position"])
         df = df[~df.grade.isin(["F", "D-"])]
         df = df.merge(self.get_salary_df(year=year, week=week))
         df = df[
@@ -83,11 +116,37 @@ class ProjectionScraper:
         ]
 
         log.info("Saving projection data..")
-        output_path = f"/app/data/projections/fp_projection_{self.current_year}_w{self.current_week}.csv"
-        df.fillna(0).drop_duplicates().to_csv(output_path, index=False)
+        output_path = f"{DATA_DIR}/projections/fp_projection_{self.current_year}_w{self.current_week}.csv"
+        df = df.fillna(0).drop_duplicates()
+        # unchanged projections are not rewritten, so the API keeps its caches
+        if (record := write_if_changed(df, output_path)) is None:
+            log.info("Projections are unchanged, skipping the write")
+            return
+        write_partition(df, "projections", self.current_year, self.current_week)
+        update_manifest(
+            "projections", self.current_year, self.current_week, output_path, len(df)
+        )
+        publish_changes(self.current_year, self.current_week, record)
+        log.info("%s players changed", len(record["players"]))
 
 
-if __name__ == "__main__":
-    log.info("Starting projection scraper..")
+def run() -> None:
+    # the current week is looked up again for every run
     scraper = ProjectionScraper()
     scraper.scrape()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="FantasyPros projection scraper.")
+    parser.add_argument(
+        "--serve", action="store_true", help="run as a resident worker taking jobs"
+    )
+    parser.add_argument("--port", type=int, default=WORKER_PORT)
+    args = parser.parse_args()
+
+    if args.serve:
+        log.info("Starting projection scraper worker..")
+        serve({"scrape": run}, WORKER_HOST, args.port)
+    else:
+        log.info("Starting projection scraper..")
+        run()
@@ -1,69 +1,81 @@
+import fcntl
+import glob
+import hashlib
 import json
+import os
 import re
-from io import StringIO
+from datetime import datetime, timezone
 from typing import List, Tuple
 
-import bs4 as bs
 import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
 import requests
-from configs import PROJECTIONS_COLUMN_MAPPINGS, STATS_COLUMN_MAPPINGS
+from configs import (
+    DATA_DIR,
+    DTYPES,
+    FANTASYPROS_URL,
+    FETCH_BACKOFF,
+    FETCH_MAX_CONNECTIONS,
+    FETCH_RETRIES,
+    FETCH_TIMEOUT,
+    MANIFEST_PATH,
+    PARQUET_DIR,
+    PROJECTIONS_COLUMN_MAPPINGS,
+    STATS_COLUMN_MAPPINGS,
+)
+from http_cache import http_cache
+from parsers import parse_data_table, parse_rankings
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+
+def get_session() -> requests.Session:
+    """Keep-alive session shared by every fetch.
+
+    The connection pool blocks at FETCH_MAX_CONNECTIONS per host, which caps how
+    hard concurrent fetches hit FantasyPros, and failed requests are retried
+    with exponential backoff.
+    """
+    retry = Retry(
+        total=FETCH_RETRIES,
+        backoff_factor=FETCH_BACKOFF,
+        status_forcelist=[429, 500, 502, 503, 504],
+        allowed_methods=["GET"],
+    )
+    adapter = HTTPAdapter(
+        pool_maxsize=FETCH_MAX_CONNECTIONS, pool_block=True, max_retries=retry
+    )
+    session = requests.Session()
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    return session
+
+
+session = get_session()
+
+
+def fetch(url: str, params: dict) -> str:
+    return http_cache.get(url, params, session=session, timeout=FETCH_TIMEOUT)
 
 
 def get_current_week(year: int):
-    url = "https://www.fantasypros.com/nfl/reports/leaders/"
+    url = f"{FANTASYPROS_URL}/nfl/reports/leaders/"
     params = {
         "year": year,
     }
-    r = requests.get(url, params=params)
-    df = pd.io.html.read_html(StringIO(r.text), attrs={"id": "data"})[0].iloc[:, 1:]
+    html = fetch(url, params)
+    df = parse_data_table(html, skip=1)
     # Find the first column where all values are NaN to get current week
     week = int(df.columns[df.isna().all()][0]) if df.isna().all().any() else 1
     return week
 
 
 def get_weekly_rankings(position: str, year: int, week: int):
-    rankings_list = []
     position = position.upper()
-    url = f"https://www.fantasypros.com/nfl/rankings/{'ppr-' if position not in ['QB', 'DST'] else ''}{position.lower()}.php"
+    url = f"{FANTASYPROS_URL}/nfl/rankings/{'ppr-' if position not in ['QB', 'DST'] else ''}{position.lower()}.php"
     params = {"year": year, "week": week}
-    r = requests.get(url, params=params)
-    cxt = bs.BeautifulSoup(r.text, features="lxml")
-    script_tags = cxt.find_all("script", attrs={"type": "text/javascript"})
-    for script_tag in script_tags:
-        script_text = script_tag.text.strip()
-        if "var ecrData =" in script_text:
-            ecrData_match = re.search(r"var ecrData = (.*?});", script_text)
-            if ecrData_match:
-                players = json.loads(ecrData_match.group(1))["players"]
-                for player in players:
-                    try:
-                        player_name = player["player_name"]
-                        position = player["player_position_id"]
-                        rank = player["rank_ecr"]
-                        rank_min = player["rank_min"]
-                        rank_max = player["rank_max"]
-                        rank_avg = player["rank_ave"]
-                        rank_std = player["rank_std"]
-                        grade = player["start_sit_grade"]
-                        fpts = player.get("r2p_pts", 0.0)
-                        rankings_list.append(
-                            {
-                                "player": str(player_name),
-                                "position": str(position),
-                                "year": int(year),
-                                "week": int(week),
-                                "rank": int(rank),
-                                "min_rank": int(rank_min),
-                                "max_rank": int(rank_max),
-                                "avg_rank": float(rank_avg),
-                                "std_rank": float(rank_std),
-                                "grade": str(grade),
-                                "proj_fpts": float(fpts),
-                            }
-                        )
-                    except:
-                        pass
-    return pd.DataFrame(rankings_list)
+    return parse_rankings(fetch(url, params), year, week)
 
 
 def get_weekly_projections(
@@ -73,15 +85,14 @@ def get_weekly_projections(
     scoring: str = "PPR",
 ):
     position = position.upper()
-    url = f"https://www.fantasypros.com/nfl/projections/{position.lower()}.php"
+    url = f"{FANTASYPROS_URL}/nfl/projections/{position.lower()}.php"
     params = {
         "year": year,
         "week": week,
         "scoring": scoring,
     }
-    r = requests.get(url, params=params)
-    df = pd.io.html.read_html(StringIO(r.text), attrs={"id": "data"})[0]
-    df.columns = PROJECTIONS_COLUMN_MAPPINGS[position]
+    html = fetch(url, params)
+    df = parse_data_table(html, PROJECTIONS_COLUMN_MAPPINGS[position])
     player_col = (
         df.player if position == "DST" else df.player.str.split().str[:-1].str.join(" ")
     )
@@ -107,7 +118,7 @@ def get_stats(
         end = weeks[1]
 
     position = position.upper()
-    url = f"https://www.fantasypros.com/nfl/stats/{position.lower()}.php"
+    url = f"{FANTASYPROS_URL}/nfl/stats/{position.lower()}.php"
     params = {
         "year": year,
         "range": range,
@@ -115,8 +126,8 @@ def get_stats(
         "end_week": end,
         "scoring": scoring,
     }
-    r = requests.get(url, params=params)
-    df = pd.io.html.read_html(StringIO(r.text), attrs={"id": "data"})[0].iloc[:, 1:]
+    html = fetch(url, params)
+    df = parse_data_table(html, STATS_COLUMN_MAPPINGS[position], skip=1)
     df.columns = [
         (
             f"avg_{col}"
@@ -144,10 +155,77 @@ def get_stats(
     df["position"] = position
     df["season"] = year
     df["week"] = end + 1
-    df["rost"] = df.rost.str.strip("%").astype(float)
     df[[col for col in df.columns if (("avg" in col) and (col != "avg_fpts"))]] = (
         df[[col for col in df.columns if (("avg" in col) and (col != "avg_fpts"))]]
         .div(df["games"], axis=0)
         .round(1)
     )
     return df.drop(columns="fpts")
+
+
+# Weekly files indexed in the manifest, as the API's app.helpers.manifest has them
+DATASET_PATTERNS = {
+    "salaries": "salaries/dk_salary_*_w*.csv",
+    "projections": "projections/fp_projection_*_w*.csv",
+}
+
+
+def scan_datasets() -> dict:
+    """Manifest entries of the datasets in DATA_DIR, from their file names."""
+    datasets = {}
+    for kind, pattern in DATASET_PATTERNS.items():
+        datasets[kind] = {}
+        for path in glob.glob(os.path.join(DATA_DIR, pattern)):
+            match = re.search(r"_(\d{4})_w(\d+)\.", os.path.basename(path))
+            if match is None:
+                continue
+            year, week = int(match.group(1)), int(match.group(2))
+            datasets[kind][f"{year}_w{week}"] = {
+                "year": year,
+                "week": week,
+                "file": os.path.relpath(path, DATA_DIR),
+            }
+    return datasets
+
+
+def update_manifest(kind: str, year: int, week: int, path: str, rows: int) -> None:
+    """Record a written dataset in the shared data manifest read by the API."""
+    with open(path, "rb") as f:
+        sha256 = hashlib.sha256(f.read()).hexdigest()
+
+    # scrapers can run concurrently, serialize the read-modify-write
+    with open(f"{MANIFEST_PATH}.lock", "w") as lock:
+        fcntl.flock(lock, fcntl.LOCK_EX)
+        try:
+            with open(MANIFEST_PATH) as f:
+                manifest = json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError):
+            # a new manifest starts from the weeks already on disk, not just
+            # the one being written
+            manifest = {"datasets": scan_datasets()}
+
+        manifest["datasets"].setdefault(kind, {})[f"{year}_w{week}"] = {
+            "year": int(year),
+            "week": int(week),
+            "file": os.path.relpath(path, DATA_DIR),
+            "rows": int(rows),
+            "sha256": sha256,
+            "updated_at": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        }
+        tmp_path = f"{MANIFEST_PATH}.tmp"
+        with open(tmp_path, "w") as f:
+            json.dump(manifest, f, indent=2, sort_keys=True)
+        os.replace(tmp_path, MANIFEST_PATH)
+
+
+def write_partition(df: pd.DataFrame, kind: str, year: int, week: int) -> str:
+    """Write a typed Parquet copy of a week next to its CSV."""
+    path = f"{PARQUET_DIR}/{kind}/year={year}/week={week}/data.parquet"
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    table = pa.Table.from_pandas(
+        df.astype(DTYPES), preserve_index=False
+    ).replace_schema_metadata(None)
+    tmp_path = f"{path}.tmp"
+    pq.write_table(table, tmp_path, compression="zstd")
+    os.replace(tmp_path, path)
+    return path
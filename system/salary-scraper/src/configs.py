@@ -1,4 +1,5 @@
 import logging
+import os
 from datetime import datetime
 import pytz
 
@@ -27,3 +28,35 @@ handler.setFormatter(formatter)
 log = logging.getLogger("salary-scraper")
 log.setLevel(logging.INFO)
 log.addHandler(handler)
+
+DATA_DIR = os.getenv("DATA_DIR", "/app/data")
+# (year, week) index of every dataset in DATA_DIR, maintained by the scrapers
+MANIFEST_PATH = f"{DATA_DIR}/manifest.json"
+# Typed copies of every week, partitioned as {kind}/year=YYYY/week=W/data.parquet
+PARQUET_DIR = f"{DATA_DIR}/parquet"
+# Column types of the salaries partitions, shared with the API
+DTYPES = {
+    "player": "string",
+    "position": "category",
+    "team": "category",
+    "opponent": "category",
+    "salary": "int32",
+}
+# Resident worker mode (python src/main.py --serve) listens here for jobs
+WORKER_HOST = os.getenv("WORKER_HOST", "0.0.0.0")
+WORKER_PORT = int(os.getenv("WORKER_PORT", "8700"))
+
+SELENIUM_URL = os.getenv("SELENIUM_URL", "http://selenium-web-driver:4444/wd/hub")
+# Longest wait for any page element or table refresh, in seconds
+PAGE_TIMEOUT = float(os.getenv("PAGE_TIMEOUT", "20"))
+# Every captured slate is saved as salaries/slates/dk_salary_{year}_w{week}_{slate}.csv,
+# the first of DEFAULT_SLATES found is also the week's dk_salary_{year}_w{week}.csv
+SLATE_DIR = f"{DATA_DIR}/salaries/slates"
+DEFAULT_SLATES = ["Thu-Mon", "Fri-Mon", "Sat-Mon", "Sat-Sun"]
+# Concurrent browser sessions reading slates, the Selenium grid must allow as many
+BROWSER_SESSIONS = int(os.getenv("BROWSER_SESSIONS", "3"))
+# DraftKings "Export to CSV" salary files (DKSalaries*.csv) dropped here are read
+# without a browser. SALARY_SOURCE is "auto" (exports, Selenium if there are
+# none), "export" or "selenium".
+EXPORT_DIR = f"{DATA_DIR}/salaries/exports"
+SALARY_SOURCE = os.getenv("SALARY_SOURCE", "auto")
@@ -0,0 +1,89 @@
+import glob
+import os
+import re
+from datetime import date, datetime
+from typing import Dict, Optional, Tuple
+
+import pandas as pd
+from configs import EXPORT_DIR, log
+
+# Removed from player names in this order, as the API's app.helpers.names does,
+# so "Marvin Harrison Jr." -> "Marvin Harrison" like on the salary site while
+# "David Sills V" is kept as the site has it
+NAME_TOKENS = ["II", " I", "Jr.", "Sr.", ".", "'"]
+# "BUF@MIA 10/06/2024 01:00PM ET"
+GAME_INFO = r"^(?P<away>\w+)@(?P<home>\w+) (?P<date>\d{2}/\d{2}/\d{4})"
+DAYS = ["Mon", "Tue", "Wed", "Thu", "Fri", "Sat", "Sun"]
+# slates run Thursday to Monday
+SLATE_DAYS = ["Thu", "Fri", "Sat", "Sun", "Mon", "Tue", "Wed"]
+
+
+def clean_player_names(names: pd.Series) -> pd.Series:
+    for token in NAME_TOKENS:
+        names = names.str.replace(token, "", regex=False)
+    return names.str.strip()
+
+
+def read_dk_export(path: str) -> Tuple[pd.DataFrame, pd.Series]:
+    """Salaries of a DraftKings "Export to CSV" file, in the scraped schema.
+
+    Also returns the date of each player's game.
+    """
+    export = pd.read_csv(
+        path,
+        usecols=[
+            "Position",
+            "Name",
+            "Roster Position",
+            "Salary",
+            "Game Info",
+            "TeamAbbrev",
+        ],
+    )
+    # showdown exports list every player again as captain at 1.5x salary
+    export = export[export["Roster Position"] != "CPT"]
+    games = export["Game Info"].str.extract(GAME_INFO)
+    export = export[games["date"].notna()]
+    games = games[games["date"].notna()]
+
+    team = export["TeamAbbrev"]
+    df = pd.DataFrame(
+        {
+            "player": clean_player_names(export["Name"]),
+            "position": export["Position"],
+            "team": team,
+            "opponent": games["home"].where(games["away"] == team, games["away"]),
+            "salary": export["Salary"].astype(int),
+        }
+    )
+    dates = pd.to_datetime(games["date"], format="%m/%d/%Y").dt.date
+    order = df["salary"].sort_values(ascending=False, kind="stable").index
+    return df.loc[order].reset_index(drop=True), dates.loc[order].reset_index(drop=True)
+
+
+def slate_name(dates: pd.Series) -> str:
+    # "Thu-Mon" like the salary site, "Sun" for a single day
+    days = sorted({DAYS[day.weekday()] for day in dates}, key=SLATE_DAYS.index)
+    return days[0] if len(days) == 1 else f"{days[0]}-{days[-1]}"
+
+
+def read_exports(today: Optional[date] = None) -> Dict[str, pd.DataFrame]:
+    """Salaries of every current DraftKings export in EXPORT_DIR, by slate.
+
+    ``DKSalaries_{slate}.csv`` names its slate, otherwise it's derived from the
+    game days. Exports whose games are all over are left out as stale.
+    """
+    today = datetime.now().date() if today is None else today
+    slates = {}
+    paths = glob.glob(f"{EXPORT_DIR}/DKSalaries*.csv")
+    for path in sorted(paths, key=os.path.getmtime):
+        df, dates = read_dk_export(path)
+        if df.empty or dates.max() < today:
+            log.info(f"Skipping stale DraftKings export {path}")
+            continue
+        match = re.match(r"DKSalaries_(.+)\.csv$", os.path.basename(path))
+        slate = match.group(1) if match else slate_name(dates)
+        # the newest export of a slate wins
+        slates[slate] = df
+        log.info(f"Read {len(df)} '{slate}' salaries from {path}")
+    return slates
@@ -1,24 +1,70 @@
+import argparse
+import os
+import queue
+import re
+import threading
+import time
 from datetime import datetime
 from io import StringIO
-from time import sleep
+from typing import Dict, Iterable, Optional
 
 import pandas as pd
 import requests
-from bs4 import BeautifulSoup
-from configs import log
+from configs import (
+    BROWSER_SESSIONS,
+    DATA_DIR,
+    DEFAULT_SLATES,
+    PAGE_TIMEOUT,
+    SALARY_SOURCE,
+    SELENIUM_URL,
+    SLATE_DIR,
+    WORKER_HOST,
+    WORKER_PORT,
+    log,
+)
+from exports import read_exports
 from selenium import webdriver
-from selenium.common.exceptions import NoSuchElementException
+from selenium.common.exceptions import StaleElementReferenceException
 from selenium.webdriver.common.by import By
-from selenium.webdriver.support.ui import Select
-from utils import get_current_week
+from selenium.webdriver.support import expected_conditions as EC
+from selenium.webdriver.support.ui import Select, WebDriverWait
+from season import current_week
+from utils import update_manifest, write_partition
+from worker import serve
+
+SALARY_TABLE = (By.ID, "prj-main-table")
+SALARY_ROWS = (By.CSS_SELECTOR, "#prj-main-table tbody tr")
+
+
+def parse_salary_table(html: str) -> pd.DataFrame:
+    """Salary frame of the DraftKings projections table."""
+    salary_df = pd.io.html.read_html(StringIO(html))[0].iloc[1:, :6]
+    salary_df.columns = [
+        "player",
+        "extra",
+        "position",
+        "team",
+        "opponent",
+        "salary",
+    ]
+    salary_df = salary_df.drop(columns=["extra"])
+    salary_df["opponent"] = salary_df.opponent.str.replace("@", "")
+    salary_df["salary"] = (
+        salary_df.salary.str.replace("$", "").str.replace(",", "").astype(int)
+    )
+    return salary_df
+
+
+def slate_slug(slate: str) -> str:
+    # "Thu-Mon" -> "thu-mon", "Sun Main" -> "sun-main"
+    return re.sub(r"[^a-z0-9]+", "-", slate.lower()).strip("-")
 
 
 class SalaryScraper:
     def __init__(self):
         self.url = "https://draftdime.com/nfl-projections"
         self.current_year = datetime.now().year
-        self.current_week = get_current_week(year=self.current_year)
-        self.check_webdriver_container()
+        self.current_week = current_week()
 
     @staticmethod
     def check_webdriver_container():
@@ -26,86 +72,222 @@ class SalaryScraper:
         log.info("Waiting for selenium webdriver..")
         while True:
             try:
-                requests.get("http://selenium-web-driver:4444/wd/hub")
+                requests.get(SELENIUM_URL)
                 break
             except:
                 continue
         log.info("Webdriver is up!")
 
-    def scrape(self, slate: str = "Thu-Mon") -> pd.DataFrame:
+    @staticmethod
+    def get_browser() -> webdriver.Remote:
         options = webdriver.ChromeOptions()
         options.add_argument("--headless")
         options.add_argument("--no-sandbox")
         options.add_argument("--disable-dev-shm-usage")
+        return webdriver.Remote(command_executor=SELENIUM_URL, options=options)
+
+    def open_salaries(self, browser: webdriver.Remote) -> WebDriverWait:
+        """Load the projections page with DraftKings salaries and the modal closed."""
+        wait = WebDriverWait(
+            browser, PAGE_TIMEOUT, ignored_exceptions=[StaleElementReferenceException]
+        )
+        browser.get(self.url)
+        site_select = wait.until(EC.presence_of_element_located((By.ID, "site-id")))
+        Select(site_select).select_by_visible_text("DraftKings")
+        wait.until(
+            EC.element_to_be_clickable((By.CSS_SELECTOR, "#sign-up-modal button"))
+        ).click()
+        wait.until(EC.invisibility_of_element_located((By.ID, "sign-up-modal")))
+        wait.until(
+            EC.presence_of_element_located((By.CSS_SELECTOR, "#slate-select option"))
+        )
+        return wait
+
+    @staticmethod
+    def slate_select(browser: webdriver.Remote) -> Select:
+        return Select(browser.find_element(by=By.ID, value="slate-select"))
+
+    def read_slate(
+        self, browser: webdriver.Remote, wait: WebDriverWait, slate: str
+    ) -> pd.DataFrame:
+        """Select ``slate`` and read the salary table once it has been redrawn.
+
+        The table counts as redrawn once it differs from the previous slate's,
+        has player rows and is unchanged since the last poll, so a loading
+        placeholder or a half filled table is not parsed.
+        """
+        slate_select = self.slate_select(browser)
+        if slate_select.first_selected_option.text != slate:
+            before = wait.until(
+                EC.presence_of_element_located(SALARY_TABLE)
+            ).get_attribute("outerHTML")
+            slate_select.select_by_visible_text(slate)
 
+            last = [None]
+
+            def redrawn(browser):
+                html = browser.find_element(*SALARY_TABLE).get_attribute("outerHTML")
+                stable, last[0] = html == last[0], html
+                if html == before or not stable:
+                    return False
+                # the first body row is not a player, see parse_salary_table
+                return html if len(browser.find_elements(*SALARY_ROWS)) > 1 else False
+
+            html = wait.until(redrawn)
+        else:
+            html = wait.until(
+                EC.presence_of_element_located(SALARY_TABLE)
+            ).get_attribute("outerHTML")
+        return parse_salary_table(html)
+
+    def read_slates(
+        self,
+        browser: webdriver.Remote,
+        wait: WebDriverWait,
+        pending: "queue.Queue[str]",
+        session: int,
+    ) -> None:
+        # each session takes the next slate until none are left
+        while True:
+            try:
+                slate = pending.get_nowait()
+            except queue.Empty:
+                return
+            start = time.perf_counter()
+            try:
+                self.captured[slate] = self.read_slate(browser, wait, slate)
+            except Exception as e:
+                # a slate that fails to load or parse doesn't stop the others
+                log.error(f"Could not read the '{slate}' slate: {e!r}")
+                continue
+            finally:
+                self.timings[slate] = time.perf_counter() - start
+            log.info(
+                f"Read {len(self.captured[slate])} '{slate}' salaries in "
+                f"{self.timings[slate]:.1f}s on session {session}"
+            )
+
+    def run_session(self, pending: "queue.Queue[str]", session: int) -> None:
+        try:
+            with self.get_browser() as browser:
+                wait = self.open_salaries(browser)
+                self.read_slates(browser, wait, pending, session)
+        except Exception as e:
+            log.error(f"Browser session {session} failed: {e!r}")
+
+    def scrape_slates(
+        self, slates: Optional[Iterable[str]] = None, sessions: int = BROWSER_SESSIONS
+    ) -> Dict[str, pd.DataFrame]:
+        """Salaries of every available slate (or only ``slates``).
+
+        The first browser session lists the slates, then up to ``sessions``
+        sessions read them concurrently against the Selenium grid. Seconds
+        spent on each slate are kept in ``self.timings``.
+        """
+        self.check_webdriver_container()
         log.info("Scraping salary data..")
-        with webdriver.Remote(
-            command_executor="http://selenium-web-driver:4444/wd/hub", options=options
-        ) as browser:
-            browser.get(self.url)
-            sleep(1)
-            site_select = Select(browser.find_element(by=By.ID, value="site-id"))
-            sleep(1)
-            site_select.select_by_visible_text("DraftKings")
-            sleep(3)
-            modal = browser.find_element(by=By.ID, value="sign-up-modal")
-            sleep(1)
-            modal.find_element(by=By.TAG_NAME, value="button").click()
-            sleep(3)
-            slate_select = Select(browser.find_element(by=By.ID, value="slate-select"))
-            sleep(2)
+        start = time.perf_counter()
+        self.captured: Dict[str, pd.DataFrame] = {}
+        self.timings: Dict[str, float] = {}
+        with self.get_browser() as browser:
+            wait = self.open_salaries(browser)
+            available = [option.text for option in self.slate_select(browser).options]
+            log.info(f"Available slates: {available}")
+            pending = queue.Queue()
+            for slate in available if slates is None else slates:
+                if slate in available:
+                    pending.put(slate)
+                else:
+                    log.error(f"No '{slate}' option was found.")
 
+            threads = [
+                threading.Thread(target=self.run_session, args=(pending, session))
+                for session in range(1, min(sessions, pending.qsize()))
+            ]
+            for thread in threads:
+                thread.start()
             try:
-                slate_select.select_by_visible_text(slate)
-                sleep(3)
-            except NoSuchElementException:
-                log.error(f"No '{slate}' option was found.")
-                return pd.DataFrame()
-
-            html = browser.page_source
-            soup = BeautifulSoup(html, "html.parser")
-            table = soup.find("table", id="prj-main-table")
-
-        salary_df = pd.io.html.read_html(StringIO(str(table)))[0].iloc[1:, :6]
-        salary_df.columns = [
-            "player",
-            "extra",
-            "position",
-            "team",
-            "opponent",
-            "salary",
-        ]
-        salary_df = salary_df.drop(columns=["extra"])
-        salary_df["opponent"] = salary_df.opponent.str.replace("@", "")
-        salary_df["salary"] = (
-            salary_df.salary.str.replace("$", "").str.replace(",", "").astype(int)
+                self.read_slates(browser, wait, pending, 0)
+            finally:
+                # the other sessions quit their browsers when they are done
+                for thread in threads:
+                    thread.join()
+
+        log.info(
+            f"Scraped {len(self.captured)} slates with {len(threads) + 1} sessions in "
+            f"{time.perf_counter() - start:.1f}s"
         )
+        return {
+            slate: self.captured[slate]
+            for slate in available
+            if slate in self.captured
+        }
 
-        return salary_df
+    def scrape(self, slate: str = "Thu-Mon") -> pd.DataFrame:
+        return self.scrape_slates([slate]).get(slate, pd.DataFrame())
+
+    def save_slate(self, slate: str, df: pd.DataFrame) -> str:
+        os.makedirs(SLATE_DIR, exist_ok=True)
+        output_path = (
+            f"{SLATE_DIR}/dk_salary_{self.current_year}_w{self.current_week}"
+            f"_{slate_slug(slate)}.csv"
+        )
+        df = df.drop_duplicates()
+        df.to_csv(output_path, index=False)
+        write_partition(
+            df, "slates", self.current_year, self.current_week, slate_slug(slate)
+        )
+        log.info(f"Saved {len(df)} '{slate}' salaries to {output_path}")
+        return output_path
 
     def save_to_csv(self, df: pd.DataFrame):
         log.info("Saving salary data..")
         output_path = (
-            f"/app/data/salaries/dk_salary_{self.current_year}_w{self.current_week}.csv"
+            f"{DATA_DIR}/salaries/dk_salary_{self.current_year}_w{self.current_week}.csv"
+        )
+        df = df.drop_duplicates()
+        df.to_csv(output_path, index=False)
+        write_partition(df, "salaries", self.current_year, self.current_week)
+        update_manifest(
+            "salaries", self.current_year, self.current_week, output_path, len(df)
         )
-        df.drop_duplicates().to_csv(output_path, index=False)
 
 
-if __name__ == "__main__":
-    log.info("Starting salary scraper..")
-    scraper = SalaryScraper()
+def default_slate(slates: Dict[str, pd.DataFrame]) -> Optional[str]:
+    # the week's main salary file keeps coming from the first of DEFAULT_SLATES
+    found = [slate for slate in DEFAULT_SLATES if slate in slates]
+    return next((slate for slate in found if not slates[slate].empty), None)
 
-    for slate in ["Thu-Mon", "Fri-Mon", "Sat-Mon", "Sat-Sun"]:
-        df = scraper.scrape(slate)
+
+def run() -> None:
+    # the current week is looked up again for every run
+    scraper = SalaryScraper()
+    slates = {}
+    if SALARY_SOURCE in ("auto", "export"):
+        slates = read_exports()
+    if default_slate(slates) is None and SALARY_SOURCE in ("auto", "selenium"):
+        # no current DraftKings export for the week's main slate, use the browser
+        slates = {**scraper.scrape_slates(), **slates}
+    for slate, df in slates.items():
         if not df.empty:
-            scraper.save_to_csv(df)
-            break
+            scraper.save_slate(slate, df)
+    if (slate := default_slate(slates)) is not None:
+        scraper.save_to_csv(slates[slate])
+    else:
+        log.error(f"None of {DEFAULT_SLATES} could be scraped")
 
-    # df = pd.DataFrame()
-    # for slate in ["Sat", "Main"]:
-    #     sub_df = scraper.scrape(slate)
-    #     if not sub_df.empty:
-    #         df = pd.concat([df, sub_df], ignore_index=True)
 
-    # if not df.empty:
-    #     scraper.save_to_csv(df)
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="DraftKings salary scraper.")
+    parser.add_argument(
+        "--serve", action="store_true", help="run as a resident worker taking jobs"
+    )
+    parser.add_argument("--port", type=int, default=WORKER_PORT)
+    args = parser.parse_args()
+
+    if args.serve:
+        log.info("Starting salary scraper worker..")
+        serve({"scrape": run}, WORKER_HOST, args.port)
+    else:
+        log.info("Starting salary scraper..")
+        run()
@@ -1,16 +1,85 @@
-from io import StringIO
+import fcntl
+import glob
+import hashlib
+import json
+import os
+import re
+from datetime import datetime, timezone
+from typing import Optional
 
 import pandas as pd
-import requests
-
-
-def get_current_week(year: int):
-    url = "https://www.fantasypros.com/nfl/reports/leaders/"
-    params = {
-        "year": year,
-    }
-    r = requests.get(url, params=params)
-    df = pd.io.html.read_html(StringIO(r.text), attrs={"id": "data"})[0].iloc[:, 1:]
-    # Find the first column where all values are NaN to get current week
-    week = int(df.columns[df.isna().all()][0]) if df.isna().all().any() else 1
-    return week
+import pyarrow as pa
+import pyarrow.parquet as pq
+from configs import DATA_DIR, DTYPES, MANIFEST_PATH, PARQUET_DIR
+
+
+# Weekly files indexed in the manifest, as the API's app.helpers.manifest has them
+DATASET_PATTERNS = {
+    "salaries": "salaries/dk_salary_*_w*.csv",
+    "projections": "projections/fp_projection_*_w*.csv",
+}
+
+
+def scan_datasets() -> dict:
+    """Manifest entries of the datasets in DATA_DIR, from their file names."""
+    datasets = {}
+    for kind, pattern in DATASET_PATTERNS.items():
+        datasets[kind] = {}
+        for path in glob.glob(os.path.join(DATA_DIR, pattern)):
+            match = re.search(r"_(\d{4})_w(\d+)\.", os.path.basename(path))
+            if match is None:
+                continue
+            year, week = int(match.group(1)), int(match.group(2))
+            datasets[kind][f"{year}_w{week}"] = {
+                "year": year,
+                "week": week,
+                "file": os.path.relpath(path, DATA_DIR),
+            }
+    return datasets
+
+
+def update_manifest(kind: str, year: int, week: int, path: str, rows: int) -> None:
+    """Record a written dataset in the shared data manifest read by the API."""
+    with open(path, "rb") as f:
+        sha256 = hashlib.sha256(f.read()).hexdigest()
+
+    # scrapers can run concurrently, serialize the read-modify-write
+    with open(f"{MANIFEST_PATH}.lock", "w") as lock:
+        fcntl.flock(lock, fcntl.LOCK_EX)
+        try:
+            with open(MANIFEST_PATH) as f:
+                manifest = json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError):
+            # a new manifest starts from the weeks already on disk, not just
+            # the one being written
+            manifest = {"datasets": scan_datasets()}
+
+        manifest["datasets"].setdefault(kind, {})[f"{year}_w{week}"] = {
+            "year": int(year),
+            "week": int(week),
+            "file": os.path.relpath(path, DATA_DIR),
+            "rows": int(rows),
+            "sha256": sha256,
+            "updated_at": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        }
+        tmp_path = f"{MANIFEST_PATH}.tmp"
+        with open(tmp_path, "w") as f:
+            json.dump(manifest, f, indent=2, sort_keys=True)
+        os.replace(tmp_path, MANIFEST_PATH)
+
+
+def write_partition(
+    df: pd.DataFrame, kind: str, year: int, week: int, slate: Optional[str] = None
+) -> str:
+    """Write a typed Parquet copy of a week (or one of its slates) next to its CSV."""
+    path = f"{PARQUET_DIR}/{kind}/year={year}/week={week}/data.parquet"
+    if slate is not None:
+        path = path.replace("/data.parquet", f"/slate={slate}/data.parquet")
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    table = pa.Table.from_pandas(
+        df.astype(DTYPES), preserve_index=False
+    ).replace_schema_metadata(None)
+    tmp_path = f"{path}.tmp"
+    pq.write_table(table, tmp_path, compression="zstd")
+    os.replace(tmp_path, path)
+    return path
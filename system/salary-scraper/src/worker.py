@@ -0,0 +1,123 @@
+import json
+import multiprocessing
+import socket
+import socketserver
+import time
+from typing import Callable, Dict, Optional
+
+from configs import log
+
+
+class WorkerUnavailable(Exception):
+    """No worker is listening at the address, the job was not sent."""
+
+
+class JobHandler(socketserver.StreamRequestHandler):
+    # one JSON request line per connection, answered with one JSON result line
+    def handle(self):
+        request = json.loads(self.rfile.readline() or "{}")
+        response = self.server.run(
+            request.get("job"), request.get("params") or {}, request.get("timeout")
+        )
+        self.wfile.write((json.dumps(response) + "\n").encode())
+
+
+def run_job(job: str, func: Callable[..., None], params: dict, conn) -> None:
+    # runs in the forked child, the result goes back over the pipe
+    try:
+        func(**params)
+        conn.send({"ok": True})
+    except Exception as e:
+        log.exception("%s job failed", job)
+        conn.send({"ok": False, "error": f"{type(e).__name__}: {e}"})
+
+
+class WorkerServer(socketserver.TCPServer):
+    """Resident scraper process taking jobs from the orchestrator over TCP.
+
+    Connections are handled one at a time on the serving thread, the only thread
+    of this process, and later ones wait in the listen backlog in arrival order
+    (the orchestrator's overlap policies send a scraper one job at a time, so
+    that backlog is normally empty). Each job runs in a child forked from here:
+    imports and configuration stay warm between jobs, no other thread can be
+    holding a lock at the fork, and a job still running past its timeout is
+    killed instead of holding up the next one.
+    """
+
+    allow_reuse_address = True
+
+    def __init__(self, address, jobs: Dict[str, Callable[..., None]]):
+        super().__init__(address, JobHandler)
+        self.jobs = jobs
+        self.context = multiprocessing.get_context("fork")
+
+    def run(self, job: Optional[str], params: dict, timeout: Optional[float]) -> dict:
+        if job == "ping":
+            return {"ok": True}
+        if job not in self.jobs:
+            return {"ok": False, "error": f"Unknown job {job!r}"}
+
+        log.info("Running %s job", job)
+        started = time.perf_counter()
+        response = self.execute(job, params, timeout)
+        response["seconds"] = round(time.perf_counter() - started, 3)
+        log.info("%s job finished in %.1fs", job, response["seconds"])
+        return response
+
+    def execute(self, job: str, params: dict, timeout: Optional[float]) -> dict:
+        receiver, sender = self.context.Pipe(duplex=False)
+        process = self.context.Process(
+            target=run_job, args=(job, self.jobs[job], params, sender), daemon=True
+        )
+        process.start()
+        sender.close()
+        try:
+            if not receiver.poll(timeout):
+                log.error("%s job still running after %.0fs, killing it", job, timeout)
+                process.kill()
+                error = f"Killed after {timeout:.0f}s"
+                return {"ok": False, "timed_out": True, "error": error}
+            try:
+                return receiver.recv()
+            except EOFError:
+                process.join()
+                return {"ok": False, "error": f"Job exited with {process.exitcode}"}
+        finally:
+            process.join()
+            receiver.close()
+
+
+def serve(jobs: Dict[str, Callable[..., None]], host: str, port: int) -> None:
+    with WorkerServer((host, port), jobs) as server:
+        log.info("Worker listening on %s:%s, jobs: %s", host, port, list(jobs))
+        server.serve_forever()
+
+
+def send_job(
+    address: str,
+    job: str,
+    params: Optional[dict] = None,
+    timeout: Optional[float] = None,
+    connect_timeout: float = 5.0,
+    grace: float = 30.0,
+) -> dict:
+    """Run ``job`` on the worker at ``host:port`` and wait for its result.
+
+    The worker kills the job after ``timeout`` seconds and answers with
+    ``timed_out`` set, the connection itself is only given up on ``grace``
+    seconds later.
+    """
+    host, port = address.rsplit(":", 1)
+    try:
+        conn = socket.create_connection((host, int(port)), timeout=connect_timeout)
+    except OSError as e:
+        raise WorkerUnavailable(f"{address}: {e}") from e
+    with conn:
+        conn.settimeout(None if timeout is None else timeout + grace)
+        request = {"job": job, "params": params or {}, "timeout": timeout}
+        conn.sendall((json.dumps(request) + "\n").encode())
+        with conn.makefile("rb") as f:
+            line = f.readline()
+    if not line:
+        raise ConnectionError(f"{address} closed the connection without a result")
+    return json.loads(line)
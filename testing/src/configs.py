@@ -1,10 +1,16 @@
 import logging
+import os
 
 from enum import Enum
 
 
 log = logging.getLogger("dfs-optimizer")
 
+# On-disk cache of FantasyPros responses, mode is online, replay or off
+HTTP_CACHE_DIR = os.getenv("HTTP_CACHE_DIR", "/app/data/http_cache")
+HTTP_CACHE_MAX_BYTES = int(os.getenv("HTTP_CACHE_MAX_BYTES", str(256 * 2**20)))
+HTTP_CACHE_MODE = os.getenv("HTTP_CACHE_MODE", "online")
+
 
 class NFLTeam(Enum):
     ARIZONA_CARDINALS = "Cardinals"
@@ -8,13 +8,15 @@ from pulp import PULP_CBC_CMD
 from tabulate import tabulate
 
 from configs import NFLTeam
-from utils import get_current_week, get_stats, get_weekly_rankings
+from names import normalize_names
+from season import current_week
+from utils import get_stats, get_weekly_rankings
 
 
 class DFSLineupOptimizer:
     def __init__(self):
         self.current_year = datetime.now().year
-        self.current_week = get_current_week(year=self.current_year)
+        self.current_week = current_week()
 
     def get_salary_df(self, year: Optional[int] = None, week: Optional[int] = None) -> pd.DataFrame:
         year = self.current_year if year is None else year
@@ -39,21 +41,7 @@ class DFSLineupOptimizer:
                 ]
             )
 
-        df["player"] = df.apply(
-            lambda x: (
-                x["player"].split()[-1]
-                if x["position"] == "DST"
-                else x["player"]
-                .replace("II", "")
-                .replace(" I", "")
-                .replace("Jr.", "")
-                .replace("Sr.", "")
-                .replace(".", "")
-                .replace("'", "")
-                .strip()
-            ),
-            axis=1,
-        )
+        df["player"] = normalize_names(df["player"], df["position"])
         df = df[~df.grade.isin(["F", "D-", "D", "D+"])]
         df = df.merge(self.get_salary_df(year=year, week=week))
         df = df[
@@ -0,0 +1,44 @@
+from typing import Callable, Dict
+
+import numpy as np
+import pandas as pd
+
+# Removed from player names in this order, "Marvin Harrison Jr." -> "Marvin Harrison"
+NAME_TOKENS = ["II", " I", "Jr.", "Sr.", ".", "'"]
+
+# Canonical name tables, raw name -> canonical name. Player pools repeat from
+# week to week, so after the first scrape almost every lookup is a hit.
+PLAYER_NAMES: Dict[str, str] = {}
+DST_NAMES: Dict[str, str] = {}
+
+
+def clean_player_names(names: pd.Series) -> pd.Series:
+    for token in NAME_TOKENS:
+        names = names.str.replace(token, "", regex=False)
+    return names.str.strip()
+
+
+def clean_dst_names(names: pd.Series) -> pd.Series:
+    # "Buffalo Bills" -> "Bills", matching the salary files
+    return names.str.split().str[-1]
+
+
+def canonical(
+    names: np.ndarray,
+    table: Dict[str, str],
+    clean: Callable[[pd.Series], pd.Series],
+) -> np.ndarray:
+    missing = [name for name in pd.unique(names) if name not in table]
+    if missing:
+        table.update(zip(missing, clean(pd.Series(missing, dtype=object))))
+    return pd.Series(names, dtype=object).map(table).to_numpy()
+
+
+def normalize_names(players: pd.Series, positions: pd.Series) -> pd.Series:
+    """Canonical player names: DSTs by nickname, no suffixes or punctuation."""
+    names = players.to_numpy(dtype=object)
+    is_dst = positions.to_numpy() == "DST"
+    normalized = np.empty(len(names), dtype=object)
+    normalized[is_dst] = canonical(names[is_dst], DST_NAMES, clean_dst_names)
+    normalized[~is_dst] = canonical(names[~is_dst], PLAYER_NAMES, clean_player_names)
+    return pd.Series(normalized, index=players.index, name=players.name)
@@ -0,0 +1,145 @@
+import json
+import re
+from typing import List, Optional, Sequence
+
+import lxml.html
+import numpy as np
+import pandas as pd
+
+ECR_DATA_MARKER = "var ecrData ="
+# (column, ecrData key, type, default) in output order. Players with a missing
+# key or a value that doesn't convert are skipped.
+RANKING_FIELDS = [
+    ("player", "player_name", str, None),
+    ("position", "player_position_id", str, None),
+    ("rank", "rank_ecr", int, None),
+    ("min_rank", "rank_min", int, None),
+    ("max_rank", "rank_max", int, None),
+    ("avg_rank", "rank_ave", float, None),
+    ("std_rank", "rank_std", float, None),
+    ("grade", "start_sit_grade", str, None),
+    ("proj_fpts", "r2p_pts", float, 0.0),
+]
+MISSING = object()
+
+decoder = json.JSONDecoder()
+
+
+def extract_ecr_players(html: str) -> List[dict]:
+    """``ecrData.players`` of a rankings page, decoded straight from the text."""
+    start = html.find(ECR_DATA_MARKER)
+    if start == -1:
+        return []
+    start = html.find("{", start + len(ECR_DATA_MARKER))
+    # raw_decode stops at the end of the object, no need to find the closing "};"
+    ecr_data, _ = decoder.raw_decode(html, start)
+    return ecr_data.get("players", [])
+
+
+def parse_rankings(html: str, year: int, week: int) -> pd.DataFrame:
+    """Rankings frame of a FantasyPros rankings page, built column by column."""
+    players = extract_ecr_players(html)
+    columns = {}
+    valid = pd.Series(True, index=range(len(players)))
+    for column, key, kind, default in RANKING_FIELDS:
+        values = pd.Series(
+            [
+                player.get(key, MISSING if default is None else default)
+                for player in players
+            ],
+            dtype=object,
+        )
+        valid &= values.map(lambda value: value is not MISSING)
+        if kind is str:
+            # str() like the per-player parser did, None becomes "None"
+            columns[column] = values.map(str)
+        else:
+            numbers = pd.to_numeric(values.where(valid), errors="coerce")
+            valid &= numbers.notna()
+            columns[column] = numbers
+    if not valid.any():
+        return pd.DataFrame()
+
+    df = pd.DataFrame({column: values[valid] for column, values in columns.items()})
+    df = df.astype(
+        {column: kind for column, _, kind, _ in RANKING_FIELDS}
+    ).reset_index(drop=True)
+    df.insert(2, "year", int(year))
+    df.insert(3, "week", int(week))
+    return df
+
+
+DATA_TABLE = re.compile(r"""<table\b[^>]*\bid=["']data["']""")
+# same whitespace handling as pd.read_html
+WHITESPACE = re.compile(r"[\r\n]+|\s{2,}")
+
+
+def find_data_table(html: str) -> lxml.html.HtmlElement:
+    """Only the ``#data`` table of a page, parsed on its own."""
+    match = DATA_TABLE.search(html)
+    if match is None:
+        raise ValueError("No #data table found")
+    end = html.find("</table>", match.end())
+    return lxml.html.fragment_fromstring(
+        html[match.start() : end + len("</table>") if end != -1 else None]
+    )
+
+
+def typed_column(values: Sequence[Optional[str]]) -> np.ndarray:
+    """Numbers (thousands separators and % signs dropped) if every cell is one.
+
+    Like ``pd.read_html``: int64 when every cell is an integer, float64 with NaN
+    for empty cells, otherwise the strings as they are.
+    """
+    cells = [value.rstrip("%").replace(",", "") for value in values if value]
+    try:
+        numbers = [float(cell) for cell in cells]
+    except ValueError:
+        return np.array(values, dtype=object)
+    if len(cells) == len(values) and all(
+        cell.lstrip("-").isdigit() for cell in cells
+    ):
+        return np.array(numbers, dtype=np.int64)
+    numbers = iter(numbers)
+    return np.array(
+        [next(numbers) if value else np.nan for value in values], dtype=np.float64
+    )
+
+
+def parse_data_table(
+    html: str, columns: Optional[List[str]] = None, skip: int = 0
+) -> pd.DataFrame:
+    """The ``#data`` table of a FantasyPros page as typed columns.
+
+    ``columns`` names the cells left after dropping the first ``skip`` ones
+    (e.g. a ``STATS_COLUMN_MAPPINGS`` schema after the rank column), defaulting
+    to the table's own header.
+    """
+    table = find_data_table(html)
+    header = [
+        WHITESPACE.sub(" ", cell.text_content().strip())
+        for cell in table.xpath("./thead/tr[last()]/th")
+    ]
+    rows = [
+        [
+            WHITESPACE.sub(" ", cell.text_content().strip()) or None
+            for cell in row.xpath("./td | ./th")
+        ]
+        for row in table.xpath(".//tr[td]")
+    ]
+    width = max([len(header)] + [len(row) for row in rows])
+    cells = [row + [None] * (width - len(row)) for row in rows]
+    if columns is None:
+        columns = (header + [None] * (width - len(header)))[skip:]
+    if len(columns) != width - skip:
+        raise ValueError(
+            f"Length mismatch: {width - skip} table columns, {len(columns)} names"
+        )
+
+    data = list(zip(*cells)) if cells else [()] * width
+    return pd.DataFrame(
+        {
+            index: typed_column(values)
+            for index, values in enumerate(data[skip:])
+        }
+    ).set_axis(columns, axis=1)
@@ -11,7 +11,7 @@ from selenium import webdriver
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import Select
 
-from utils import get_current_week
+from season import current_week
 
 
 class SalaryScraper:
@@ -19,7 +19,7 @@ class SalaryScraper:
         self.on_demand = on_demand
         self.url = "https://draftdime.com/nfl-projections"
         self.current_year = datetime.now().year
-        self.current_week = get_current_week(year=self.current_year)
+        self.current_week = current_week()
         self.check_webdriver_container()
 
     @staticmethod
@@ -0,0 +1,37 @@
+from datetime import date, timedelta
+from typing import Optional, Tuple
+
+# Regular season length, 18 weeks since the 2021 season
+WEEKS = {2020: 17}
+DEFAULT_WEEKS = 18
+
+
+def kickoff(season: int) -> date:
+    """Opening Thursday of a season, the Thursday after Labor Day."""
+    september = date(season, 9, 1)
+    labor_day = september + timedelta(days=(0 - september.weekday()) % 7)
+    return labor_day + timedelta(days=3)
+
+
+def season_of(day: date) -> int:
+    # January and February games belong to the season that started the year
+    # before, which is also how FantasyPros files them
+    return day.year if day.month > 2 else day.year - 1
+
+
+def season_week(day: Optional[date] = None) -> Tuple[int, int]:
+    """(season, week) of the slate being played on ``day``, today by default.
+
+    Weeks turn over on the Tuesday before their Thursday game, once the
+    previous week's Monday night game is over. Dates before kickoff are week 1,
+    dates after the regular season its last week.
+    """
+    day = date.today() if day is None else day
+    season = season_of(day)
+    start = kickoff(season) - timedelta(days=2)
+    week = (day - start).days // 7 + 1
+    return season, min(max(week, 1), WEEKS.get(season, DEFAULT_WEEKS))
+
+
+def current_week(day: Optional[date] = None) -> int:
+    return season_week(day)[1]